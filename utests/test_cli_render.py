@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from xenakis_py import cli_render
+
+
+@pytest.mark.parametrize("n,win", [(1000, 7), (1000, 8), (24000, 24000), (64, 1)])
+def test_boxcar_matches_convolve_same(n, win):
+    x = np.random.default_rng(n + win).normal(size=n)
+    expected = np.convolve(x, np.ones(win) / win, mode="same")
+    np.testing.assert_allclose(cli_render._boxcar_same(x, win), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("n,win", [(1, 4), (5, 7), (5, 8), (100, 24000)])
+def test_boxcar_shorter_than_window(n, win):
+    # convolve(mode="same") returns win samples here; the same centred,
+    # zero-padded windows are the first n of "full" from (win - 1) // 2
+    x = np.random.default_rng(n).normal(size=n)
+    expected = np.convolve(x, np.ones(win) / win, mode="full")[(win - 1) // 2:][:n]
+    np.testing.assert_allclose(cli_render._boxcar_same(x, win), expected, atol=1e-12)
+
+
+def test_breathing_pan_shorter_than_window():
+    pan = cli_render.make_breathing_pan(100, 48000, speed_hz=0.1, seed=1)
+    assert pan.shape == (100,)
+    assert np.all(np.abs(pan) <= 1.0)
+
+
+def _mono_and_pan(n, dtype):
+    rng = np.random.default_rng(n)
+    return rng.uniform(-1, 1, n).astype(dtype), rng.uniform(-1, 1, n)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_equal_power_stereo_matches_column_stack(monkeypatch, dtype):
+    monkeypatch.setattr(cli_render, "ne", None)
+    mono, pan = _mono_and_pan(1000, dtype)
+    theta = (pan + 1.0) * (np.pi / 4.0)
+    expected = np.column_stack((mono * np.cos(theta), mono * np.sin(theta)))
+    stereo = cli_render.equal_power_stereo(mono, pan)
+    assert stereo.shape == (1000, 2)
+    np.testing.assert_allclose(stereo, expected, rtol=1e-6 if dtype is np.float32 else 1e-12)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_numexpr_and_numpy_branches_agree(monkeypatch, dtype):
+    numexpr = pytest.importorskip("numexpr")
+    mono, pan = _mono_and_pan(5000, dtype)
+    monkeypatch.setattr(cli_render, "ne", numexpr)
+    pan_ne = cli_render.make_breathing_pan(30000, 48000, speed_hz=0.08, seed=7)
+    stereo_ne = cli_render.equal_power_stereo(mono, pan)
+    monkeypatch.setattr(cli_render, "ne", None)
+    pan_np = cli_render.make_breathing_pan(30000, 48000, speed_hz=0.08, seed=7)
+    stereo_np = cli_render.equal_power_stereo(mono, pan)
+    assert stereo_ne.dtype == stereo_np.dtype
+    assert np.allclose(pan_ne, pan_np)
+    assert np.allclose(stereo_ne, stereo_np, rtol=1e-5, atol=1e-6)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from xenakis_py.dss_gendy import GendySynth
+
+SR = 8000
+
+
+@pytest.mark.parametrize("n", [1, 1600, 4000])
+def test_generate_into_matches_generate(n):
+    synth = GendySynth()
+    ref = synth.generate(duration=0.6, seed=3, sr=SR)
+    assert len(ref) >= n
+    out = synth.generate_into(np.empty(n, dtype=np.float32), seed=3, sr=SR)
+    np.testing.assert_array_equal(out, ref[:n])
+
+
+def test_generate_into_strided_column():
+    synth = GendySynth()
+    stereo = np.zeros((1600, 2), dtype=np.float32)
+    synth.generate_into(stereo[:, 1], seed=5, sr=SR)
+    np.testing.assert_array_equal(stereo[:, 1], synth.generate(duration=0.6, seed=5, sr=SR)[:1600])
+    assert not stereo[:, 0].any()
+
+
+def test_generate_channels_matches_per_seed_waveform():
+    synth = GendySynth()
+    seeds = [11, 12, 13]
+    out = synth.generate_channels(np.empty((2000, len(seeds)), dtype=np.float32), seeds, sr=SR)
+    for c, seed in enumerate(seeds):
+        np.testing.assert_array_equal(out[:, c], synth.generate_waveform(sr=SR, seed=seed, n_samples=2000))
+
+
+@pytest.mark.parametrize("shape,match", [((100, 2), "seeds"), ((100,), "2D"), ((100, 4), "seeds")])
+def test_generate_channels_shape_mismatch(shape, match):
+    with pytest.raises(ValueError, match=match):
+        GendySynth().generate_channels(np.empty(shape, dtype=np.float32), [1, 2, 3], sr=SR)
+
+
+def test_generate_channels_needs_a_seed():
+    with pytest.raises(ValueError, match="at least one seed"):
+        GendySynth().generate_channels(np.empty((100, 0), dtype=np.float32), [], sr=SR)
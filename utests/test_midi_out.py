@@ -0,0 +1,51 @@
+import mido
+import pytest
+from xenakis_py.midi_out import MidiEvent, MidiRenderer, _encode_vlq
+
+VLQ_EDGES = [0, 127, 128, 16383, 16384, 0x0FFFFFFF]
+
+
+@pytest.mark.parametrize("n", VLQ_EDGES)
+def test_encode_vlq_matches_mido(n):
+    assert _encode_vlq(n) == bytes(mido.midifiles.midifiles.encode_variable_int(n))
+
+
+def test_direct_save_matches_mido(tmp_path):
+    # 60 bpm and 1 tick per beat: one tick per second, so seconds are deltas
+    r = MidiRenderer(ticks_per_beat=1, tempo=60)
+    # Non-overlapping notes whose on/off deltas walk the VLQ edge values
+    t = 0
+    for gap, dur, chan in ((0, 127, 0), (128, 16383, 0), (16384, 0x0FFFFFFF, 1)):
+        t += gap
+        r.add_event(MidiEvent(time=t, pitch=60 + chan, velocity=100, duration=dur, channel=chan))
+        t += dur
+    # A chord: repeated note_on then note_off statuses (running status), then
+    # a switch back to channel 0
+    r.add_events(times=[t, t, t + 1], pitches=[64, 67, 70],
+                 velocities=[90, 80, 70], durations=1, channels=[1, 1, 0])
+
+    direct, via_mido = tmp_path / "direct.mid", tmp_path / "mido.mid"
+    r.save(str(direct))
+    r.save(str(via_mido), use_mido=True)
+    assert direct.read_bytes() == via_mido.read_bytes()
+    ticks = [m.time for m in mido.MidiFile(str(direct)).tracks[0] if m.type.startswith("note")]
+    assert ticks[:6] == VLQ_EDGES
+
+
+def test_direct_save_empty_matches_mido(tmp_path):
+    r = MidiRenderer()
+    direct, via_mido = tmp_path / "direct.mid", tmp_path / "mido.mid"
+    r.save(str(direct))
+    r.save(str(via_mido), use_mido=True)
+    assert direct.read_bytes() == via_mido.read_bytes()
+
+
+def test_events_snapshot_is_immutable_and_assignable():
+    r = MidiRenderer()
+    r.add_event(MidiEvent(time=1.0, pitch=62))
+    r.add_events(times=[0.5], pitches=[60])
+    assert isinstance(r.events, tuple)
+    with pytest.raises(AttributeError):
+        r.events.append(MidiEvent(time=2.0, pitch=64))
+    r.events = sorted(r.events, key=lambda ev: ev.time)
+    assert [ev.pitch for ev in r.events] == [60, 62]
@@ -1,5 +1,5 @@
 import unittest
-from xenakis_py.mkv_screens import get_screen_params, ScreenState
+from xenakis_py.mkv_screens import get_screen_params, get_screen_row, ScreenState
 
 class TestMKVScreens(unittest.TestCase):
     def test_screen_A_params(self):
@@ -58,5 +58,14 @@ class TestMKVScreens(unittest.TestCase):
         self.assertEqual(params["density"], 15)
         self.assertEqual(params["duration"], 1.1)
 
+    def test_screen_rows_match_params_and_keep_ints(self):
+        for state in ScreenState:
+            params = get_screen_params(state)
+            row = get_screen_row(state)
+            self.assertEqual(row, (*params["pitch_range"], *params["velocity_range"],
+                                   params["density"], params["duration"]))
+            self.assertTrue(all(type(v) is int for v in row[:5]))
+            self.assertIs(type(row[5]), float)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
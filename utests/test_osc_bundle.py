@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from pythonosc.osc_bundle_builder import IMMEDIATELY, OscBundleBuilder
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from xenakis_py import osc_bundle
+
+
+def _reference_bundle(address, rows):
+    bundle = OscBundleBuilder(IMMEDIATELY)
+    for row in rows:
+        msg = OscMessageBuilder(address=address)
+        for v in row:
+            msg.add_arg(float(v), arg_type="f")
+        bundle.add_content(msg.build())
+    return bundle.build().dgram
+
+
+@pytest.mark.parametrize("k", [2, 5])
+def test_encode_bundle_matches_builder(k):
+    full = osc_bundle.max_bundle_msgs("/upic", k)
+    for n in (1, full):
+        rows = np.random.default_rng(n).uniform(0, 2000, (n, k))
+        assert osc_bundle.encode_bundle("/upic", rows) == _reference_bundle("/upic", rows)
+
+
+@pytest.mark.parametrize("address", ["/a", "/abc", "/abcd", "/upic_live"])
+@pytest.mark.parametrize("k", [1, 2, 3, 4])
+def test_encode_bundle_string_padding(address, k):
+    # Addresses and type tags of every length mod 4 pad to a 4-byte boundary
+    rows = np.arange(3 * k, dtype=np.float64).reshape(3, k)
+    assert osc_bundle.encode_bundle(address, rows) == _reference_bundle(address, rows)
+
+
+def test_osc_message_matches_builder():
+    assert osc_bundle.osc_message("/upic_live", (440, 0.5)).dgram == \
+        _reference_bundle("/upic_live", [(440, 0.5)])[16 + 4:]
+    assert osc_bundle.osc_message("/upic_live_release", ()).dgram == \
+        OscMessageBuilder(address="/upic_live_release").build().dgram
+
+
+@pytest.mark.parametrize("k,expected", [(2, 60), (5, 36)])
+def test_bundles_fit_one_mtu(k, expected):
+    n = osc_bundle.max_bundle_msgs("/upic", k)
+    assert n == expected
+    rows = np.zeros((n, k))
+    assert len(osc_bundle.encode_bundle("/upic", rows)) <= osc_bundle.MAX_DATAGRAM
+    assert len(osc_bundle.encode_bundle("/upic", np.zeros((n + 1, k)))) > osc_bundle.MAX_DATAGRAM
+
+
+@pytest.mark.parametrize("k", [2, 5])
+def test_send_bundled_splits_at_max(k):
+    class Capture:
+        def __init__(self):
+            self.dgrams = []
+
+        def send(self, content):
+            self.dgrams.append(content.dgram)
+
+    m = osc_bundle.max_bundle_msgs("/upic", k)
+    rows = np.random.default_rng(0).uniform(0, 1, (2 * m + 1, k))
+    client = Capture()
+    osc_bundle.send_bundled(client, "/upic", rows.tolist())
+    assert client.dgrams == [_reference_bundle("/upic", rows[i:i + m]) for i in range(0, len(rows), m)]
+    osc_bundle.send_bundled(client, "/upic", [])
+    assert len(client.dgrams) == 3
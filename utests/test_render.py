@@ -0,0 +1,72 @@
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+from xenakis_py import render
+from xenakis_py.render import quantise_pcm16, render_multichannel_to_wav
+
+# Longer than one streaming block, with a partial last block
+N_FRAMES = render._BLOCK_FRAMES + 1234
+
+
+def _waveform(peak):
+    rng = np.random.default_rng(1)
+    w = rng.uniform(-1, 1, (N_FRAMES, 2)).astype(np.float32)
+    w[-1, 1] = peak  # the peak sits in the last block, after earlier blocks are written
+    return w
+
+
+def _round_trip(waveform, **kwargs):
+    buf = io.BytesIO()
+    assert render_multichannel_to_wav(waveform, buf, sr=48000, **kwargs) is buf
+    buf.seek(0)
+    data, sr = sf.read(buf, dtype=waveform.dtype if waveform.dtype == np.int16 else "int16")
+    assert sr == 48000
+    return data
+
+
+@pytest.mark.parametrize("peak", [0.5, 3.0])
+def test_float_input_round_trips_through_bytesio(peak):
+    w = _waveform(peak)
+    data = _round_trip(w)
+    assert data.shape == w.shape
+    np.testing.assert_array_equal(data, quantise_pcm16(w))
+    if peak > 1.0:
+        assert data.max() >= 32766  # normalised over the whole file, not per block
+
+
+def test_int16_input_is_written_as_is():
+    pcm = quantise_pcm16(_waveform(0.9))
+    np.testing.assert_array_equal(_round_trip(pcm), pcm)
+
+
+def test_float32_output_round_trips():
+    w = _waveform(0.7)
+    buf = io.BytesIO()
+    render_multichannel_to_wav(w, buf, bit_depth=32)
+    buf.seek(0)
+    data, _ = sf.read(buf, dtype="float32")
+    np.testing.assert_array_equal(data, w)
+
+
+def test_quantise_pcm16_into_strided_column():
+    w = _waveform(2.0)[:, 0]
+    stereo = np.zeros((w.size, 2), dtype=np.int16)
+    quantise_pcm16(w, out=stereo[:, 1])
+    np.testing.assert_array_equal(stereo[:, 1], quantise_pcm16(w))
+    assert not stereo[:, 0].any()
+
+
+def test_quantise_pcm16_empty():
+    assert quantise_pcm16(np.empty(0, dtype=np.float32)).shape == (0,)
+
+
+def test_quantise_pcm16_in_place_work_buffer():
+    w = _waveform(2.0)[:, 0].copy()
+    expected = quantise_pcm16(w)
+    out = np.empty(w.size, dtype=np.int16)
+    assert quantise_pcm16(w, out=out, work=w) is out
+    np.testing.assert_array_equal(out, expected)
+    with pytest.raises(ValueError):
+        quantise_pcm16(w, work=np.empty(w.size, dtype=np.float64))
@@ -52,3 +52,50 @@ def test_period_is_lcm_of_moduli():
                ("intersection", {"modulus": 6, "residues": [5]}),
                ("union", {"modulus": 7, "residues": [0]})])
     assert s.period() == math.lcm(4,6,7)
+
+def _naive(clauses, start, end, shift=0):
+    # Baseline semantics: fold the clauses over the window; an empty running
+    # result takes an intersection/complement clause as-is
+    universe = range(start, end + 1)
+    result = [False] * len(universe)
+    for op, c in clauses:
+        hits = [((x - shift) % c["modulus"]) in {r % c["modulus"] for r in c["residues"]} for x in universe]
+        if op == "complement":
+            hits = [not h for h in hits]
+        if op == "union":
+            result = [a or b for a, b in zip(result, hits)]
+        elif any(result):
+            result = [a and b for a, b in zip(result, hits)]
+        else:
+            result = hits
+    return [x for x, keep in zip(universe, result) if keep]
+
+_SIEVES = [
+    # period 35: every window below is smaller or larger than it
+    [("union", {"modulus": 5, "residues": [0, 3]}),
+     ("union", {"modulus": 7, "residues": [1]})],
+    [("intersection", {"modulus": 4, "residues": [1, 2]}),
+     ("complement", {"modulus": 6, "residues": [5]}),
+     ("union", {"modulus": 9, "residues": [0]})],
+    [("complement", {"modulus": 3, "residues": [0]}),
+     ("intersection", {"modulus": 8, "residues": [3, 5, 7]})],
+    # period 17017: windows under and over the kernel threshold inside one period
+    [("union", {"modulus": 7, "residues": [2]}),
+     ("intersection", {"modulus": 11, "residues": [1, 4, 9]}),
+     ("complement", {"modulus": 13, "residues": [0]}),
+     ("union", {"modulus": 17, "residues": [16]})],
+]
+
+@pytest.mark.parametrize("kernel", [True, False])
+@pytest.mark.parametrize("clauses", _SIEVES)
+@pytest.mark.parametrize("start,end,shift", [
+    (0, 20, 0), (-13, 50, 3), (5, 200, -4),
+    (-100, 16000, 2), (-20, 16500, 5), (3, 20000, 7), (-9000, 30000, -11),
+])
+def test_generate_matches_naive(monkeypatch, kernel, clauses, start, end, shift):
+    from xenakis_py import sieve
+    if not kernel:
+        monkeypatch.setattr(sieve, "_mask_kernel", None)
+    s = Sieve(clauses)
+    s.shift(shift)
+    assert s.generate(start, end) == _naive(clauses, start, end, shift)
@@ -35,3 +35,33 @@ def test_cloud_quantises_to_allowed():
     )
     ev = cloud.draw_event(now=time.time())
     assert ev.pitch in allowed
+
+def test_scheduler_batch_in_window():
+    sched = PoissonScheduler(lambda t: 5.0, max_rate=5.0, seed=13)
+    ts = sched.generate_batch(100.0, 120.0)
+    assert ts.size > 0
+    assert (ts > 100.0).all() and (ts < 120.0).all()
+    assert (ts[1:] > ts[:-1]).all()
+
+def test_quantise_pitch_returns_allowed_int():
+    allowed = [41, 48, 53, 60, 65, 72]
+    cloud = StochasticCloud(
+        pitch_field=Normal(60, 10, seed=14),
+        dur_field=Uniform(0.1, 0.2, seed=15),
+        vel_field=Uniform(30, 100, seed=16),
+        chan_field=Categorical([0], seed=17),
+        scheduler=PoissonScheduler(lambda t: 1.0, max_rate=1.0, seed=18),
+        allowed_pitches=allowed,
+        pitch_quantise=True,
+    )
+    q = cloud._quantise_pitch(65.4)
+    assert isinstance(q, int)
+    assert q == 65
+    assert all(cloud._quantise_pitch(p) in allowed for p in range(30, 90))
+
+def test_draw_many_batch_and_hold():
+    vals = Normal(0, 1, hard_clip=(-2, 2), seed=19).draw_many(500, now=10.0)
+    assert vals.shape == (500,)
+    assert (vals >= -2).all() and (vals <= 2).all()
+    held = Uniform(0, 1, hold=1.0, seed=20).draw_many(5, now=10.0)
+    assert (held == held[0]).all()
@@ -0,0 +1,53 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+
+from xenakis_py.webui import webui_render
+
+PARAMS = {
+    "amp_lo": 0.1, "amp_hi": 0.9,
+    "dur_lo": 0.001, "dur_hi": 0.01,
+    "freq_lo": 100.0, "freq_hi": 1000.0,
+    "chaos": 0.5, "memory": 0.5,
+    "duration": 0.05,
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_render(request):
+        return io.BytesIO(b"RIFF")
+
+    monkeypatch.setattr(webui_render, "_render", fake_render)
+    monkeypatch.setattr(webui_render, "_jobs", webui_render.OrderedDict())
+    return TestClient(webui_render.app)
+
+
+def test_job_fetched_once(client):
+    job_id = client.post("/render-dss/jobs", json=PARAMS).json()["job_id"]
+    r = client.get(f"/render-dss/jobs/{job_id}")
+    assert r.status_code == 200 and r.content == b"RIFF"
+    assert client.get(f"/render-dss/jobs/{job_id}").status_code == 404
+    assert not webui_render._jobs
+
+
+def test_unfetched_jobs_evicted_over_cap(client, monkeypatch):
+    monkeypatch.setattr(webui_render, "_JOBS_MAX", 2)
+    ids = [client.post("/render-dss/jobs", json=PARAMS).json()["job_id"] for _ in range(5)]
+    assert list(webui_render._jobs) == ids[-2:]
+    assert client.get(f"/render-dss/jobs/{ids[0]}").status_code == 404
+    assert client.get(f"/render-dss/jobs/{ids[-1]}").status_code == 200
+
+
+def test_unfetched_jobs_expire(client, monkeypatch):
+    job_id = client.post("/render-dss/jobs", json=PARAMS).json()["job_id"]
+    monkeypatch.setattr(webui_render, "_JOB_TTL", 0.0)
+    assert client.get(f"/render-dss/jobs/{job_id}").status_code == 404
+    assert not webui_render._jobs
+
+
+@pytest.mark.parametrize("duration", [0.0, 1e-6, -1.0])
+def test_render_rejects_sub_sample_duration(client, duration):
+    r = client.post("/render-dss", json=dict(PARAMS, duration=duration))
+    assert r.status_code == 422
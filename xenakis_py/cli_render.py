@@ -3,24 +3,46 @@
 import argparse
 import numpy as np
 
+try:
+    import numexpr as ne  # optional: multi-threaded SIMD sin/cos kernels
+except ImportError:
+    ne = None
+
 from xenakis_py.dss_gendy import GendySynth
 from xenakis_py.render import render_multichannel_to_wav
 
 
+def _boxcar_same(x: np.ndarray, win: int) -> np.ndarray:
+    """
+    Boxcar moving average via cumulative sums: O(N) instead of O(N * win).
+    Windows are aligned like np.convolve(x, np.ones(win) / win, mode="same")
+    with zero padding; the output always has len(x) samples, also when
+    len(x) < win (where convolve would return win samples).
+    """
+    n = x.shape[0]
+    csum = np.concatenate(([0.0], np.cumsum(x)))
+    ends = np.arange(n) + (win - 1) // 2 + 1
+    starts = np.maximum(ends - win, 0)
+    return (csum[np.minimum(ends, n)] - csum[starts]) / win
+
+
 def make_breathing_pan(num_samples: int, sr: int, speed_hz: float,
                        noise_strength: float = 0.25, seed=None) -> np.ndarray:
     rng = np.random.default_rng(seed)
     t = np.arange(num_samples) / sr
 
     # Slow LFO drift
-    lfo = np.sin(2 * np.pi * speed_hz * t)
+    w = 2 * np.pi * speed_hz
+    if ne is not None:
+        lfo = ne.evaluate("sin(w * t)", local_dict={"w": w, "t": t})
+    else:
+        lfo = np.sin(w * t)
 
     # Smooth random walk
     steps = rng.normal(scale=0.015, size=num_samples)
     walk = np.cumsum(steps)
     win = max(1, int(sr * 0.5))  # ~0.5s smoothing
-    kernel = np.ones(win) / win
-    walk_smoothed = np.convolve(walk, kernel, mode="same")
+    walk_smoothed = _boxcar_same(walk, win)
     walk_smoothed /= (np.max(np.abs(walk_smoothed)) + 1e-12)
 
     pan = 0.7 * lfo + noise_strength * walk_smoothed
@@ -28,10 +50,20 @@ def make_breathing_pan(num_samples: int, sr: int, speed_hz: float,
 
 
 def equal_power_stereo(mono: np.ndarray, pan: np.ndarray) -> np.ndarray:
+    # Write gains straight into the [samples, 2] output and scale in place
+    stereo = np.empty((mono.shape[0], 2), dtype=np.result_type(mono.dtype, np.float32))
+    if ne is not None:
+        env = {"mono": mono, "pan": pan, "q": np.pi / 4.0}
+        ne.evaluate("mono * cos((pan + 1.0) * q)", local_dict=env, out=stereo[:, 0], casting="same_kind")
+        ne.evaluate("mono * sin((pan + 1.0) * q)", local_dict=env, out=stereo[:, 1], casting="same_kind")
+        return stereo
+
     theta = (pan + 1.0) * (np.pi / 4.0)
-    left = mono * np.cos(theta)
-    right = mono * np.sin(theta)
-    return np.column_stack([left, right])
+    np.cos(theta, out=stereo[:, 0])
+    stereo[:, 0] *= mono
+    np.sin(theta, out=stereo[:, 1])
+    stereo[:, 1] *= mono
+    return stereo
 
 
 def main():
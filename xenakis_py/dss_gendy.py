@@ -1,9 +1,105 @@
 # xenakis_py/dss_gendy.py
 
+import math
 import numpy as np
 import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Literal
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy segment renderer is used instead
+    njit = None
+
+
+# ---------------------------------------------------------
+# Segment renderers
+# ---------------------------------------------------------
+# Both renderers share one contract: consume one row of uniform draws
+# (dur, amp, freq) per segment, write samples into out[cursor:], and stop
+# when `duration` is reached, the draws run out, or `out` is full.
+# They return the updated (cursor, draws_used, amp, freq, phase, t).
+
+def _gendy_core(out, draws, cursor, amp, freq, phase, t, duration, sr,
+                amp_lo, amp_hi, freq_lo, freq_hi, dur_lo, dur_hi, memory, rate):
+    two_pi = 2.0 * math.pi
+    i = 0
+    while t < duration and i < draws.shape[0]:
+        seg_dur = (dur_lo + (dur_hi - dur_lo) * draws[i, 0]) / rate
+        seg_samples = max(1, int(seg_dur * sr))
+        if cursor + seg_samples > out.shape[0]:
+            break
+
+        next_amp = memory * amp + (1 - memory) * (amp_lo + (amp_hi - amp_lo) * draws[i, 1])
+        next_freq = (memory * 0.85) * freq + (1 - memory * 0.85) * (freq_lo + (freq_hi - freq_lo) * draws[i, 2])
+
+        step = 1.0 / (seg_samples - 1) if seg_samples > 1 else 0.0
+        for k in range(seg_samples):
+            blend = k * step
+            shape = blend ** 1.5
+            phase += two_pi * (freq + (next_freq - freq) * blend) / sr
+            out[cursor + k] = ((1 - shape) * amp + shape * next_amp) * math.sin(phase)
+        phase %= two_pi
+
+        cursor += seg_samples
+        amp = next_amp
+        freq = next_freq
+        t += seg_dur
+        i += 1
+    return cursor, i, amp, freq, phase, t
+
+
+def _gendy_segments_numpy(out, draws, cursor, amp, freq, phase, t, duration, sr,
+                          amp_lo, amp_hi, freq_lo, freq_hi, dur_lo, dur_hi, memory, rate):
+    two_pi = 2 * np.pi
+    i = 0
+    while t < duration and i < draws.shape[0]:
+        u_dur, u_amp, u_freq = draws[i]
+        seg_dur = (dur_lo + (dur_hi - dur_lo) * u_dur) / rate
+        seg_samples = max(1, int(seg_dur * sr))
+        if cursor + seg_samples > out.shape[0]:
+            break
+
+        next_amp = memory * amp + (1 - memory) * (amp_lo + (amp_hi - amp_lo) * u_amp)
+        next_freq = (memory * 0.85) * freq + (1 - memory * 0.85) * (freq_lo + (freq_hi - freq_lo) * u_freq)
+
+        shape = np.power(np.linspace(0, 1, seg_samples), 1.5)
+        amp_env = (1 - shape) * amp + shape * next_amp
+        freq_env = np.linspace(freq, next_freq, seg_samples)
+
+        # Continuous phase: accumulate per-sample increments in one pass
+        phases = phase + np.cumsum(freq_env * (two_pi / sr))
+        np.multiply(amp_env, np.sin(phases), out=out[cursor:cursor + seg_samples], casting="same_kind")
+        phase = phases[-1] % two_pi
+
+        cursor += seg_samples
+        amp = next_amp
+        freq = next_freq
+        t += seg_dur
+        i += 1
+    return cursor, i, amp, freq, phase, t
+
+
+if njit is not None:
+    # nogil: independent renders (e.g. stereo channels) can run on threads
+    _render_segments = njit(cache=True, fastmath=True, nogil=True)(_gendy_core)
+else:
+    _render_segments = _gendy_segments_numpy
+
+# Whether renders on separate threads actually run in parallel
+KERNEL_RELEASES_GIL = njit is not None
+
+
+def warm_up(sr: int = 48000) -> None:
+    """
+    Compile (or load from numba's cache) the segment kernel now, so the first
+    real render doesn't stall on it. Covers contiguous output buffers; a
+    strided view (e.g. a stereo column) specialises on its first use.
+    """
+    GendySynth().generate_waveform(n_samples=64, sr=sr, seed=0)
+
 
 class GendySynth:
     """
@@ -23,6 +119,7 @@ class GendySynth:
         self.backend = backend
         self.osc_host = osc_host
         self.osc_port = osc_port
+        self._sock = None  # UDP socket, opened on the first send_osc()
 
         # Base parameter defaults (can be overridden)
         self.params = params or {
@@ -65,48 +162,127 @@ class GendySynth:
     # ---------------------------------------------------------
     # ✅ Correct smooth waveform generator (no clicks)
     # ---------------------------------------------------------
-    def generate_waveform(self, duration: float = 5.0, sr: int = 44100) -> np.ndarray:
+    def _segment_params(self) -> tuple:
+        # (amp_lo, amp_hi, freq_lo, freq_hi, dur_lo, dur_hi, memory, rate) as floats
+        p = self.params
+        # ✅ This is where MIDI will later modify rate live (read once per render)
+        rate = max(float(p.get("rate", 1.0)), 1e-6)
+        return (
+            float(p["amp_lo"]), float(p["amp_hi"]), float(p["freq_lo"]), float(p["freq_hi"]),
+            float(p["dur_lo"]), float(p["dur_hi"]), float(p["memory"]), rate,
+        )
+
+    def generate_waveform(self, duration: float = 5.0, sr: int = 44100, seed: int | None = None,
+                          *, n_samples: int | None = None) -> np.ndarray:
+        """
+        Render `duration` seconds (the last segment runs to its end), or exactly
+        n_samples samples when given, ignoring duration.
+        """
+        if n_samples is not None:
+            return self.generate_into(np.empty(n_samples, dtype=np.float32), seed=seed, sr=sr)
         if self.backend != "mock":
             raise NotImplementedError("Waveform generation only available in mock mode.")
 
-        amp_lo = self.params["amp_lo"]
-        amp_hi = self.params["amp_hi"]
-        freq_lo = self.params["freq_lo"]
-        freq_hi = self.params["freq_hi"]
-        dur_lo = self.params["dur_lo"]
-        dur_hi = self.params["dur_hi"]
-        memory = self.params["memory"]
+        seg = self._segment_params()
+        freq_lo, freq_hi, dur_lo, dur_hi, rate = seg[2], seg[3], seg[4], seg[5], seg[7]
+        rng = np.random.default_rng(seed)
+
+        # Expected segment count with headroom; topped up if a render needs more
+        mean_seg = max((dur_lo + dur_hi) / 2.0 / rate, 1.0 / sr)
+        n_draws = int(duration / mean_seg * 1.25) + 16
+        draws = rng.random((n_draws, 3))
+
+        # Upper bound: the last segment may start just before `duration`
+        out = np.empty(int((duration + dur_hi / rate) * sr) + 8, dtype=np.float32)
+        cursor = 0
 
         amp = 0.0
         freq = (freq_lo + freq_hi) / 2.0
         phase = 0.0
-
         t = 0.0
-        out = []
 
-        while t < duration:
-            # ✅ This is where MIDI will later modify rate live
-            rate = float(self.params.get("rate", 1.0))
-            seg_dur = np.random.uniform(dur_lo, dur_hi) / max(rate, 1e-6)
-            seg_samples = max(1, int(seg_dur * sr))
+        while True:
+            cursor, used, amp, freq, phase, t = _render_segments(
+                out, draws, cursor, amp, freq, phase, t, float(duration), float(sr), *seg,
+            )
+            if t >= duration:
+                break
+            if used < draws.shape[0]:
+                # Sub-sample segments overran the bound; grow and resume
+                out = np.resize(out, 2 * out.size)
+                draws = draws[used:]
+            else:
+                draws = rng.random((n_draws, 3))
+
+        return out[:cursor]
+
+    def generate(self, duration: float = 5.0, seed: int | None = None, sr: int = 44100) -> np.ndarray:
+        """Alias of generate_waveform() with seed as the second argument."""
+        return self.generate_waveform(duration=duration, sr=sr, seed=seed)
+
+    def generate_into(self, out: np.ndarray, seed: int | None = None, sr: int = 44100) -> np.ndarray:
+        """
+        Fill a caller-provided 1-D float32 buffer (e.g. one column of a stereo
+        array) with exactly len(out) samples and return it. Same signal as
+        generate_waveform() with the same seed, without the final copy.
+        """
+        if self.backend != "mock":
+            raise NotImplementedError("Waveform generation only available in mock mode.")
+
+        seg = self._segment_params()
+        freq_lo, freq_hi, dur_lo, dur_hi, rate = seg[2], seg[3], seg[4], seg[5], seg[7]
+        rng = np.random.default_rng(seed)
+        n = out.shape[0]
 
-            next_amp = memory * amp + (1 - memory) * np.random.uniform(amp_lo, amp_hi)
-            next_freq = (memory * 0.85) * freq + (1 - memory * 0.85) * np.random.uniform(freq_lo, freq_hi)
+        mean_seg = max((dur_lo + dur_hi) / 2.0 / rate, 1.0 / sr)
+        n_draws = int(n / sr / mean_seg * 1.25) + 16
+        draws = rng.random((n_draws, 3))
 
-            blend = np.linspace(0, 1, seg_samples)
-            amp_env = (1 - blend**1.5) * amp + (blend**1.5) * next_amp
-            freq_env = np.linspace(freq, next_freq, seg_samples)
+        cursor = 0
+        amp = 0.0
+        freq = (freq_lo + freq_hi) / 2.0
+        phase = 0.0
+        t = 0.0
 
-            two_pi = 2 * np.pi
-            for k in range(seg_samples):
-                phase += two_pi * freq_env[k] / sr
-                out.append(amp_env[k] * np.sin(phase))
+        # No duration limit: the buffer length is the only stop condition
+        while cursor < n:
+            cursor, used, amp, freq, phase, t = _render_segments(
+                out, draws, cursor, amp, freq, phase, t, math.inf, float(sr), *seg,
+            )
+            if cursor >= n:
+                break
+            if used < draws.shape[0]:
+                # The next segment overruns the buffer: render it to a scratch
+                # tail and keep the part that fits
+                tail = np.empty(int(dur_hi / rate * sr) + 2, dtype=np.float32)
+                _render_segments(
+                    tail, draws[used:used + 1], 0, amp, freq, phase, t, math.inf, float(sr), *seg,
+                )
+                out[cursor:] = tail[:n - cursor]
+                break
+            draws = rng.random((n_draws, 3))
 
-            amp = next_amp
-            freq = next_freq
-            t += seg_dur
+        return out
 
-        return np.array(out, dtype=np.float32)
+    def generate_channels(self, out: np.ndarray, seeds, sr: int = 44100) -> np.ndarray:
+        """
+        Fill each column of a [samples, channels] float32 buffer with an
+        independent render, seeds[c] for column c, and return it. Columns
+        render concurrently: the compiled kernel releases the GIL (without
+        numba they simply take turns).
+        """
+        seeds = list(seeds)
+        if not seeds:
+            raise ValueError("generate_channels needs at least one seed.")
+        if out.ndim != 2:
+            raise ValueError(f"out must be 2D [samples, channels], got shape {out.shape}.")
+        if out.shape[1] != len(seeds):
+            raise ValueError(f"out has {out.shape[1]} channels but {len(seeds)} seeds were given; "
+                             "pass one seed per channel.")
+        with ThreadPoolExecutor(max_workers=len(seeds)) as ex:
+            list(ex.map(lambda c: self.generate_into(out[:, c], seed=seeds[c], sr=sr),
+                        range(len(seeds))))
+        return out
 
     # ---------------------------------------------------------
     # OSC backend (unchanged)
@@ -124,18 +300,26 @@ class GendySynth:
         ]
 
         osc_msg = self._build_osc_message(msg)
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.sendto(osc_msg, (self.osc_host, self.osc_port))
-        sock.close()
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.sendto(osc_msg, (self.osc_host, self.osc_port))
+
+    def __del__(self):
+        sock = getattr(self, "_sock", None)
+        if sock is not None:
+            sock.close()
 
     def _build_osc_message(self, values):
-        def encode_string(s):
-            s = s.encode("utf-8")
-            return s + b"\x00" * (4 - len(s) % 4)
-        def encode_float(f):
-            return np.float32(f).tobytes()
-
-        address = encode_string(values[0])
-        type_tags = encode_string("," + "f" * (len(values) - 1))
-        args = b"".join(encode_float(v) for v in values[1:])
-        return address + type_tags + args
+        # Address + type tags depend only on (address, arg count): cached.
+        # Floats are packed big-endian in one call, as OSC requires.
+        n = len(values) - 1
+        return _osc_header(values[0], n) + struct.pack(f">{n}f", *values[1:])
+
+
+@lru_cache(maxsize=32)
+def _osc_header(address: str, n_floats: int) -> bytes:
+    def encode_string(s):
+        s = s.encode("utf-8")
+        return s + b"\x00" * (4 - len(s) % 4)
+
+    return encode_string(address) + encode_string("," + "f" * n_floats)
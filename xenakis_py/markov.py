@@ -14,11 +14,11 @@ Includes methods for generating sequences, computing stationary distributions, a
 Reference: Formalized Music, Chapter III, pp. 88–109.
 """
 
-from enum import Enum
+from enum import IntEnum
 import numpy as np
 
-class ScreenState(Enum):
-    """Enum representing the 8 screen states (A–H)."""
+class ScreenState(IntEnum):
+    """Enum representing the 8 screen states (A–H); members index the MTPZ rows directly."""
     A = 0  # f₀, g₀, d₀
     B = 1  # f₀, g₀, d₁
     C = 2  # f₀, g₁, d₀
@@ -28,6 +28,9 @@ class ScreenState(Enum):
     G = 6  # f₁, g₁, d₀
     H = 7  # f₁, g₁, d₁
 
+# Index → member lookup (cheaper than calling the Enum constructor)
+_STATES = tuple(ScreenState)
+
 class MarkovChain:
     """
     MarkovChain class for generating screen sequences based on the MTPZ matrix.
@@ -52,31 +55,52 @@ class MarkovChain:
         else:
             matrix = np.array(transition_matrix)
 
+        self._set_matrix(matrix)
+
+    def _set_matrix(self, matrix: np.ndarray) -> None:
+        """
+        Normalize rows of the transition matrix and cache their cumulative distributions.
+        """
         # Normalize each row to ensure probabilities sum to 1
         self.transition_matrix = matrix / matrix.sum(axis=1, keepdims=True)
+        self._cdf = np.cumsum(self.transition_matrix, axis=1)
+        self._cdf[:, -1] = 1.0  # guard against rounding so u < 1 always lands in a state
+        self._stationary = None  # recomputed lazily for the new matrix
 
     def next_state(self, current_state: ScreenState) -> ScreenState:
         """
         Given the current screen state, return the next state based on transition probabilities.
         """
-        probabilities = self.transition_matrix[current_state.value]
-        next_index = np.random.choice(range(8), p=probabilities)
-        return ScreenState(next_index)
+        u = np.random.random()
+        return _STATES[int(np.searchsorted(self._cdf[current_state], u, side="right"))]
 
     def generate_sequence(self, start_state: ScreenState, length: int) -> list[ScreenState]:
         """
         Generate a sequence of screen states of given length starting from start_state.
         """
-        sequence = [start_state]
-        current_state = start_state
-        for _ in range(length - 1):
-            current_state = self.next_state(current_state)
-            sequence.append(current_state)
-        return sequence
+        if length <= 1:
+            return [start_state]
+        # Walk on integer indices; convert to ScreenState once at the end
+        cdf = self._cdf
+        us = np.random.random(length - 1)
+        out = np.empty(length, dtype=np.int8)
+        cur = int(start_state)
+        out[0] = cur
+        for i in range(1, length):
+            cur = int(np.searchsorted(cdf[cur], us[i - 1], side="right"))
+            out[i] = cur
+        return [_STATES[i] for i in out.tolist()]
+
     def stationary_distribution(self) -> dict[ScreenState, float]:
         """
         Compute the stationary distribution of the Markov chain.
+        The result is cached until the transition matrix changes.
         """
+        if self._stationary is None:
+            self._stationary = self._compute_stationary()
+        return dict(self._stationary)
+
+    def _compute_stationary(self) -> dict[ScreenState, float]:
         eigvals, eigvecs = np.linalg.eig(self.transition_matrix.T)
         stat_dist = np.real(eigvecs[:, np.isclose(eigvals, 1)])
         stat_dist = stat_dist[:, 0]
@@ -87,5 +111,4 @@ class MarkovChain:
         """
         Apply a perturbation matrix to the transition matrix.
         """
-        matrix = np.array(perturbation_matrix)
-        self.transition_matrix = matrix / matrix.sum(axis=1, keepdims=True)
\ No newline at end of file
+        self._set_matrix(np.array(perturbation_matrix))
\ No newline at end of file
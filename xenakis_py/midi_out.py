@@ -1,5 +1,7 @@
 # xenakis_py/midi_out.py
+import struct
 from dataclasses import dataclass
+import numpy as np
 from mido import MidiFile, MidiTrack, Message, MetaMessage, bpm2tempo
 
 @dataclass
@@ -14,54 +16,132 @@ class MidiRenderer:
     def __init__(self, ticks_per_beat: int = 480, tempo: int = 120):
         self.ticks_per_beat = ticks_per_beat
         self.tempo_bpm = tempo
-        self.events: list[MidiEvent] = []
+        # Events are stored column-wise (time, pitch, velocity, duration, channel)
+        # as a list of array blocks; single add_event() calls are staged as tuples
+        # and folded into a block when the columns are needed.
+        self._blocks: list[tuple[np.ndarray, ...]] = []
+        self._staged: list[tuple] = []
 
     def add_event(self, ev: MidiEvent) -> None:
-        self.events.append(ev)
+        self._staged.append((
+            ev.time,
+            ev.pitch,
+            getattr(ev, 'velocity', 64),
+            getattr(ev, 'duration', 0.1),
+            getattr(ev, 'channel', 0),
+        ))
 
-    def _sec_to_ticks(self, seconds: float, tempo_us_per_beat: int) -> int:
-        # ticks = seconds * (ticks_per_beat * 1e6 / tempo_us_per_beat)
-        ticks = seconds * (self.ticks_per_beat * 1_000_000 / tempo_us_per_beat)
-        return max(0, int(round(ticks)))
+    def add_events(self, times, pitches, velocities=64, durations=0.1, channels=0) -> None:
+        """
+        Append a batch of events from array-likes; scalars are broadcast.
+        """
+        self._flush_staged()
+        self._blocks.append(self._as_columns(times, pitches, velocities, durations, channels))
+
+    @property
+    def events(self) -> tuple[MidiEvent, ...]:
+        """
+        Snapshot of the stored events as MidiEvent objects, in insertion order.
+        It is a tuple, so in-place edits fail instead of being lost: add with
+        add_event()/add_events(), or assign a new sequence to replace them all.
+        """
+        times, pitches, vels, durs, chans = (c.tolist() for c in self._columns())
+        return tuple(MidiEvent(t, p, v, d, c) for t, p, v, d, c in zip(times, pitches, vels, durs, chans))
+
+    @events.setter
+    def events(self, events) -> None:
+        self._blocks = []
+        self._staged = []
+        for ev in events:
+            self.add_event(ev)
+
+    @staticmethod
+    def _as_columns(times, pitches, velocities, durations, channels) -> tuple[np.ndarray, ...]:
+        t, p, v, d, c = np.broadcast_arrays(
+            np.asarray(times, dtype=np.float64),
+            np.asarray(pitches, dtype=np.int64),
+            np.asarray(velocities, dtype=np.int64),
+            np.asarray(durations, dtype=np.float64),
+            np.asarray(channels, dtype=np.int64),
+        )
+        return tuple(np.ravel(col).copy() for col in (t, p, v, d, c))
+
+    def _flush_staged(self) -> None:
+        if self._staged:
+            self._blocks.append(self._as_columns(*zip(*self._staged)))
+            self._staged = []
+
+    def _columns(self) -> tuple[np.ndarray, ...]:
+        self._flush_staged()
+        if not self._blocks:
+            return self._as_columns([], [], [], [], [])
+        if len(self._blocks) > 1:
+            self._blocks = [tuple(np.concatenate(cols) for cols in zip(*self._blocks))]
+        return self._blocks[0]
+
+    def _sec_to_ticks(self, seconds: np.ndarray, tempo_us_per_beat: int) -> np.ndarray:
+        # ticks = seconds * (ticks_per_beat * 1e6 / tempo_us_per_beat), clamped at 0;
+        # the scale is loop-invariant, so convert whole arrays in one pass
+        scale = self.ticks_per_beat * 1_000_000 / tempo_us_per_beat
+        return np.maximum(0, np.rint(seconds * scale).astype(np.int64))
+
+    def _note_stream(self, tempo_us: int) -> tuple[np.ndarray, ...]:
+        """
+        Time-ordered note messages as aligned arrays: (delta, status, note, velocity).
+        """
+        times, pitches, vels, durs, chans = self._columns()
+        for name, col, hi in (("note", pitches, 127), ("velocity", vels, 127), ("channel", chans, 15)):
+            if col.size and (col.min() < 0 or col.max() > hi):
+                raise ValueError(f"{name} must be in range 0..{hi}")
+
+        # Interleave [on_0, off_0, on_1, off_1, ...]; order: 0 = note_off first at same tick, 1 = note_on
+        ticks = np.empty(2 * times.size, dtype=np.int64)
+        ticks[0::2] = self._sec_to_ticks(times, tempo_us)
+        ticks[1::2] = self._sec_to_ticks(times + durs, tempo_us)
+        order = np.tile(np.array([1, 0], dtype=np.int8), times.size)
+
+        # Sort to guarantee non-decreasing time (lexsort is stable)
+        perm = np.lexsort((order, ticks))
+        deltas = np.diff(ticks[perm], prepend=0)
+        if deltas.size and deltas.max() >= 1 << 28:
+            raise ValueError("delta time too large for a MIDI file")
 
-    def save(self, filename: str) -> None:
+        i = perm >> 1
+        is_off = (perm & 1).astype(bool)
+        status = np.where(is_off, 0x80, 0x90) | chans[i]
+        velocity = np.where(is_off, 0, vels[i])
+        return deltas, status, pitches[i], velocity
+
+    def save(self, filename: str, use_mido: bool = False) -> None:
         """
         Robust save:
         - Build absolute tick times for note_on and note_off
         - Sort by (abs_tick, order) with note_off before note_on at the same tick
-        - Emit deltas as non-negative times (clamped at 0 if numerical jitter appears)
+        - Emit deltas as non-negative times
+        - Serialize the track bytes directly; use_mido=True goes through mido
+          Message objects instead (same file, much slower for large scores)
         """
         tempo_us = bpm2tempo(self.tempo_bpm)
+        deltas, status, notes, velocity = self._note_stream(tempo_us)
+
+        if use_mido:
+            self._save_mido(filename, tempo_us, deltas, status, notes, velocity)
+            return
+
+        name = b'Analogique A'
+        track = bytearray()
+        track += b'\x00\xff\x51\x03' + tempo_us.to_bytes(3, 'big')   # set_tempo
+        track += b'\x00\xff\x03' + _encode_vlq(len(name)) + name      # track_name
+        track += b'\x00\xc0\x00'                                       # program_change ch0 -> 0
+        track += b'\x00\xb0\x07\x78'                                   # control_change ch0 volume=120
+        track += _encode_notes(deltas, status, notes, velocity, running_status=0xB0)
+        track += b'\x00\xff\x2f\x00'                                   # end_of_track
 
-        abs_msgs: list[tuple[int, int, Message]] = []
-        for ev in self.events:
-            start = max(0.0, float(ev.time))
-            end   = max(0.0, float(ev.time) + float(getattr(ev, "duration", 0.1)))
-
-            on_tick  = self._sec_to_ticks(start, tempo_us)
-            off_tick = self._sec_to_ticks(end,   tempo_us)
-
-            # order: 0 = note_off first at same tick, 1 = note_on
-            abs_msgs.append((
-                on_tick, 1,
-                Message('note_on',
-                        note=int(ev.pitch),
-                        velocity=int(getattr(ev, 'velocity', 64)),
-                        channel=int(getattr(ev, 'channel', 0)),
-                        time=0)
-            ))
-            abs_msgs.append((
-                off_tick, 0,
-                Message('note_off',
-                        note=int(ev.pitch),
-                        velocity=0,
-                        channel=int(getattr(ev, 'channel', 0)),
-                        time=0)
-            ))
-
-        # Sort to guarantee non-decreasing time
-        abs_msgs.sort(key=lambda t: (t[0], t[1]))
+        with open(filename, 'wb') as f:
+            f.write(b'MThd' + struct.pack('>Lhhh', 6, 1, 1, self.ticks_per_beat))
+            f.write(b'MTrk' + struct.pack('>L', len(track)) + track)
 
+    def _save_mido(self, filename, tempo_us, deltas, status, notes, velocity) -> None:
         mid = MidiFile(ticks_per_beat=self.ticks_per_beat)
         track = MidiTrack()
         mid.tracks.append(track)
@@ -71,14 +151,48 @@ class MidiRenderer:
         track.append(MetaMessage('track_name', name='Analogique A', time=0))
         track.append(Message('program_change', channel=0, program=0, time=0))
         track.append(Message('control_change', channel=0, control=7, value=120, time=0))
-        last_tick = 0
-        for abs_tick, _order, msg in abs_msgs:
-            delta = abs_tick - last_tick
-            if delta < 0:
-                # absolute safety against any rounding/backwards insertion
-                delta = 0
-            msg.time = delta
-            track.append(msg)
-            last_tick = abs_tick
+
+        for delta, st, note, vel in zip(deltas.tolist(), status.tolist(), notes.tolist(), velocity.tolist()):
+            kind = 'note_off' if st < 0x90 else 'note_on'
+            track.append(Message(kind, note=note, velocity=vel, channel=st & 0x0F, time=delta))
 
         mid.save(filename)
+
+
+def _encode_vlq(n: int) -> bytes:
+    """MIDI variable-length quantity, most significant 7-bit group first."""
+    out = [n & 0x7F]
+    n >>= 7
+    while n:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    return bytes(reversed(out))
+
+
+def _encode_notes(deltas, status, notes, velocity, running_status: int) -> bytes:
+    """
+    Encode 3-byte channel messages with their delta times in one vectorized pass,
+    omitting repeated status bytes (running status) as mido does.
+    """
+    n = deltas.size
+    if n == 0:
+        return b''
+    n_vlq = 1 + (deltas >= 1 << 7) + (deltas >= 1 << 14) + (deltas >= 1 << 21)
+    prev = np.empty(n, dtype=status.dtype)
+    prev[0] = running_status
+    prev[1:] = status[:-1]
+    has_status = status != prev
+
+    lengths = n_vlq + has_status + 2
+    starts = np.cumsum(lengths) - lengths
+    buf = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(4):
+        m = n_vlq > k
+        remaining = n_vlq[m] - 1 - k
+        buf[starts[m] + k] = ((deltas[m] >> (7 * remaining)) & 0x7F) | np.where(remaining > 0, 0x80, 0)
+    pos = starts + n_vlq
+    buf[pos[has_status]] = status[has_status]
+    pos += has_status
+    buf[pos] = notes
+    buf[pos + 1] = velocity
+    return buf.tobytes()
@@ -6,10 +6,10 @@ Each screen is rendered as a stochastic cloud of MIDI events, but all events are
 Output: analogique_b_demo.mid
 Duration: ~44 seconds (40 screens × 1.1 sec)
 """
-import random
+import numpy as np
 from xenakis_py.markov import MarkovChain, ScreenState
-from xenakis_py.mkv_screens import get_screen_params
-from xenakis_py.midi_out import MidiRenderer, MidiEvent
+from xenakis_py.mkv_screens import get_screen_row
+from xenakis_py.midi_out import MidiRenderer
 
 # Initialize the Markov chain with default MTPZ matrix
 markov_chain = MarkovChain()
@@ -28,34 +28,30 @@ SINE_PROGRAM = 81  # General MIDI: Lead 2 (sawtooth) or 88 (pad), but for true s
 
 renderer.set_program(SINE_CHANNEL, SINE_PROGRAM)
 
+# Generator for per-screen event draws (batched per screen)
+rng = np.random.default_rng()
+
 # Generate MIDI events for each screen
 current_time = 0.0
 for screen_state in screen_sequence:
-    params = get_screen_params(screen_state)
-    pitch_min, pitch_max = params["pitch_range"]
-    vel_min, vel_max = params["velocity_range"]
-    density = params["density"]
-    duration = params["duration"]
+    pitch_min, pitch_max, vel_min, vel_max, density, duration = get_screen_row(screen_state)
     # Calculate number of events based on density
     num_events = int(density * duration)
-    for _ in range(num_events):
-        pitch = random.randint(pitch_min, pitch_max)
-        velocity = random.randint(vel_min, vel_max)
-        start_offset = random.uniform(0, duration)
-        event = MidiEvent(
-            time=current_time + start_offset,
-            pitch=pitch,
-            velocity=velocity,
-            duration=0.3,
-            channel=SINE_CHANNEL
-        )
-        renderer.add_event(event)
+    pitches = rng.integers(pitch_min, pitch_max + 1, size=num_events)
+    velocities = rng.integers(vel_min, vel_max + 1, size=num_events)
+    start_offsets = rng.uniform(0, duration, size=num_events)
+    renderer.add_events(
+        times=current_time + start_offsets,
+        pitches=pitches,
+        velocities=velocities,
+        durations=0.3,
+        channels=SINE_CHANNEL
+    )
     current_time += duration
 
 if __name__ == "__main__":
     import time
-    # Ensure events are sorted before saving (not strictly required, but safe)
-    renderer.events.sort(key=lambda e: (e.time, getattr(e, "pitch", 0)))
+    # No pre-sort needed: save() orders note_on/note_off by tick in one stable pass
     # Generate timestamp
     ts = time.strftime("%Y%m%d_%H%M%S")
     # Save with timestamp
@@ -17,6 +17,8 @@ This module maps each screen state to a dictionary of parameters used for stocha
 These mappings are used by mkv_markov.py and mkv_analogique_a.py to generate MIDI sequences that simulate the evolution of musical textures over time.
 """
 
+import numpy as np
+
 from xenakis_py.markov import ScreenState
 
 
@@ -93,6 +95,35 @@ screen_mappings = {
     },
 }
 
+# Flat, read-only view of screen_mappings: one row per state in A..H order.
+# Columns pitch_lo, pitch_hi, vel_lo, vel_hi, density stay integers (they feed
+# rng.integers bounds and MIDI fields); durations are a separate float column.
+_ORDERED = [m for _, m in sorted(screen_mappings.items(), key=lambda kv: kv[0])]
+SCREEN_TABLE = np.array(
+    [[*m["pitch_range"], *m["velocity_range"], m["density"]] for m in _ORDERED],
+    dtype=np.int64,
+)
+SCREEN_TABLE.flags.writeable = False
+SCREEN_DURATIONS = np.array([m["duration"] for m in _ORDERED], dtype=np.float64)
+SCREEN_DURATIONS.flags.writeable = False
+
+# The same rows as Python scalars, so callers unpack plain ints and a float
+_SCREEN_ROWS = tuple(
+    (*row, duration) for row, duration in zip(SCREEN_TABLE.tolist(), SCREEN_DURATIONS.tolist())
+)
+
+def get_screen_row(state: ScreenState) -> tuple:
+    """
+    Returns the table row for a given screen state.
+
+    Args:
+        state (ScreenState): One of A–H
+
+    Returns:
+        tuple: pitch_lo, pitch_hi, vel_lo, vel_hi, density (ints), duration (float)
+    """
+    return _SCREEN_ROWS[state]
+
 def get_screen_params(state: ScreenState) -> dict:
     """
     Returns the parameter dictionary for a given screen state.
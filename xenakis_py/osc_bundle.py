@@ -0,0 +1,77 @@
+# xenakis_py/osc_bundle.py
+"""
+OSC bundle helpers shared by the UPIC servers and demos.
+
+Paths are sent to SuperCollider as IMMEDIATELY bundles of float messages.
+Each bundle is kept to one unfragmented UDP datagram: a 1500-byte Ethernet MTU
+leaves 1472 bytes after the IP and UDP headers, and losing any fragment of a
+larger datagram would drop the whole bundle.
+"""
+
+import logging
+from collections import namedtuple
+
+import numpy as np
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+# UDP payload that fits one 1500-byte MTU frame (minus 20 IP + 8 UDP bytes)
+MAX_DATAGRAM = 1472
+
+_BUNDLE_HEADER = b"#bundle\0" + (1).to_bytes(8, "big")  # IMMEDIATELY
+
+log = logging.getLogger(__name__)
+
+def _osc_pad(b: bytes) -> bytes:
+    b += b"\0"
+    return b + b"\0" * (-len(b) % 4)
+
+def _element_dtype(address: str, n_args: int) -> np.dtype:
+    # size prefix, padded address, padded type tags, big-endian float32 args
+    addr = _osc_pad(address.encode())
+    tags = _osc_pad(b"," + b"f" * n_args)
+    return np.dtype([("size", ">i4"), ("addr", f"S{len(addr)}"),
+                     ("tags", f"S{len(tags)}"), ("args", ">f4", (n_args,))])
+
+def max_bundle_msgs(address: str, n_args: int) -> int:
+    """Messages of n_args floats to address that fit one MAX_DATAGRAM bundle
+    (/upic with 2 args: 24 bytes each, 60 per bundle; with 5 args: 36)."""
+    return (MAX_DATAGRAM - len(_BUNDLE_HEADER)) // _element_dtype(address, n_args).itemsize
+
+def encode_bundle(address: str, rows) -> bytes:
+    """
+    Encode an (n, k) float array as one IMMEDIATELY OSC bundle of n messages
+    with k float args each. Every element has the same layout, so the whole
+    bundle is one structured-array tobytes() instead of a builder per message.
+    """
+    rows = np.asarray(rows, dtype=np.float64)
+    elem = _element_dtype(address, rows.shape[1])
+    elems = np.empty(len(rows), dtype=elem)
+    elems["size"] = elem.itemsize - 4
+    elems["addr"] = _osc_pad(address.encode())
+    elems["tags"] = _osc_pad(b"," + b"f" * rows.shape[1])
+    elems["args"] = rows
+    return _BUNDLE_HEADER + elems.tobytes()
+
+def osc_message(address: str, row):
+    """One message with every value of row as a float arg (for mixed bundles)."""
+    msg = OscMessageBuilder(address=address)
+    for v in row:
+        msg.add_arg(float(v))
+    return msg.build()
+
+# UDPClient.send() only reads .dgram, so pre-encoded bytes go out as-is
+_RawDgram = namedtuple("_RawDgram", "dgram")
+
+def send_bundled(client, address: str, rows) -> None:
+    """Send each row as one OSC message, in as few MTU-sized bundles as fit."""
+    rows = np.asarray(rows, dtype=np.float64)
+    if not len(rows):
+        return
+    step = max_bundle_msgs(address, rows.shape[1])
+    for i in range(0, len(rows), step):
+        client.send(_RawDgram(encode_bundle(address, rows[i:i + step])))
+
+def log_send_error(fut) -> None:
+    """Done-callback for fire-and-forget sends: log the error instead of losing it."""
+    if not fut.cancelled() and fut.exception() is not None:
+        log.error("OSC path send failed", exc_info=fut.exception())
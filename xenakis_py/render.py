@@ -2,59 +2,120 @@ import os
 import numpy as np
 import soundfile as sf
 from datetime import datetime
+from typing import BinaryIO, Optional, Union
 
 # Force output directory
 ROOT_OUT = r"C:\Users\usuario\Documents\PR_xenakis"
 
+# Bit depth -> (subtype, output dtype, full scale, work dtype). Scales are typed
+# scalars of the work dtype: float32 holds every int16 step exactly, 24-bit
+# needs float64 to keep the low bits.
+_SUBTYPES = {
+    16: ('PCM_16', np.int16,   np.float32(32767.0),   np.float32),
+    24: ('PCM_24', np.int32,   np.float64(8388607.0), np.float64),
+    32: ('FLOAT',  np.float32, np.float32(1.0),       np.float32),
+}
+
+# Frames converted per write: bounds peak memory to one block, not a full copy
+_BLOCK_FRAMES = 262144
+
+def _normalise_gain(waveform: np.ndarray) -> float:
+    # Normalise if peak exceeds 1.0; max/min avoid an abs() temporary, and the
+    # gain is folded into the output scaling so the input is never copied
+    if waveform.size == 0:
+        return 1.0
+    peak = max(float(waveform.max()), -float(waveform.min()))
+    return 1.0 / peak if peak > 1.0 else 1.0
+
+def quantise_pcm16(samples: np.ndarray, out: Optional[np.ndarray] = None,
+                   work: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Float samples -> int16 PCM, scaled, normalised and clipped exactly as
+    render_multichannel_to_wav(bit_depth=16) would. out may be a strided
+    view (e.g. one column of a stereo int16 buffer). work, a float32 array
+    of samples' shape, holds the scaled values instead of a fresh temporary;
+    it may be samples itself when the float input is no longer needed.
+    """
+    _, dtype, scale, work_dtype = _SUBTYPES[16]
+    if work is None:
+        work = np.empty(samples.shape, dtype=work_dtype)
+    elif work.dtype != work_dtype or work.shape != samples.shape:
+        raise ValueError("work must be a float32 array shaped like samples")
+    np.multiply(samples, float(scale) * _normalise_gain(samples), out=work, casting='unsafe')
+    np.clip(work, -scale, scale - 1, out=work)
+    if out is None:
+        return work.astype(dtype)
+    np.copyto(out, work, casting='unsafe')
+    return out
+
 def render_multichannel_to_wav(
     waveform: np.ndarray,
-    filename: str,
+    filename: Union[str, BinaryIO],
     sr: int = 48000,
     bit_depth: int = 16
-) -> str:
+) -> Union[str, BinaryIO]:
     """
     Save a multichannel audio waveform to WAV with timestamp.
     waveform must be shape [samples, channels].
+    filename may also be a writable binary file object (e.g. io.BytesIO);
+    the WAV is then written into it as-is and the object is returned.
+    An int16 waveform is taken as finished 16-bit PCM (see quantise_pcm16)
+    and written without scaling.
     """
 
     if waveform.ndim != 2:
         raise ValueError("waveform must be 2D [samples, channels].")
 
-    # Normalise if peak exceeds 1.0
-    peak = float(np.max(np.abs(waveform)))
-    if peak > 1.0:
-        waveform = waveform / peak
-
-    # Create timestamped filename
-    timestamp = datetime.now().strftime("_%Y%m%d_%H%M")
-    base, ext = os.path.splitext(filename)
-    if not ext:
-        ext = ".wav"
-    final_name = f"{base}{timestamp}{ext}"
-
-    # Ensure output directory exists
-    os.makedirs(ROOT_OUT, exist_ok=True)
-    full_path = os.path.join(ROOT_OUT, final_name)
-
-    # Bit depth subtype + dtype handling
-    subtype_map = {
-        16: ('PCM_16', np.int16,  32767),
-        24: ('PCM_24', np.int32,  8388607),
-        32: ('FLOAT',  np.float32, 1.0),
-    }
-
-    if bit_depth not in subtype_map:
+    if bit_depth not in _SUBTYPES:
         raise ValueError("bit_depth must be 16, 24 or 32")
 
-    subtype, dtype, scale = subtype_map[bit_depth]
+    pcm_input = waveform.dtype == np.int16
+    if pcm_input and bit_depth != 16:
+        raise ValueError("int16 waveforms are already 16-bit PCM; use bit_depth=16")
 
-    if bit_depth == 32:
-        out = waveform.astype(np.float32)
+    if hasattr(filename, "write"):
+        full_path, fmt = filename, 'WAV'  # no extension to infer the format from
     else:
-        out = (waveform * scale).clip(-scale, scale-1).astype(dtype)
+        # Create timestamped filename
+        timestamp = datetime.now().strftime("_%Y%m%d_%H%M")
+        base, ext = os.path.splitext(filename)
+        if not ext:
+            ext = ".wav"
+        final_name = f"{base}{timestamp}{ext}"
+
+        # Ensure output directory exists
+        os.makedirs(ROOT_OUT, exist_ok=True)
+        full_path, fmt = os.path.join(ROOT_OUT, final_name), None
+
+    subtype, dtype, scale, work = _SUBTYPES[bit_depth]
+
+    if pcm_input:
+        with sf.SoundFile(full_path, 'w', samplerate=sr, channels=waveform.shape[1], subtype=subtype, format=fmt) as f:
+            f.write(waveform)
+        if isinstance(full_path, str):
+            print(f"✅ Saved WAV → {full_path}")
+        return full_path
+
+    gain = _normalise_gain(waveform)
+
+    # Scale (and clip, for PCM) each block in place in reused work/output
+    # buffers, cast once, and stream it to the file
+    n_frames, channels = waveform.shape
+    block = min(n_frames, _BLOCK_FRAMES)
+    buf = np.empty((block, channels), dtype=work)
+    pcm = buf if dtype is work else np.empty((block, channels), dtype=dtype)
+    g = float(scale) * gain
 
-    # Write file
-    sf.write(full_path, out, sr, subtype=subtype)
+    with sf.SoundFile(full_path, 'w', samplerate=sr, channels=channels, subtype=subtype, format=fmt) as f:
+        for i in range(0, n_frames, _BLOCK_FRAMES):
+            chunk = waveform[i:i + _BLOCK_FRAMES]
+            b, out = buf[:len(chunk)], pcm[:len(chunk)]
+            np.multiply(chunk, g, out=b, casting='unsafe')
+            if bit_depth != 32:
+                np.clip(b, -scale, scale - 1, out=b)
+                np.copyto(out, b, casting='unsafe')
+            f.write(out)
 
-    print(f"✅ Saved WAV → {full_path}")
+    if isinstance(full_path, str):
+        print(f"✅ Saved WAV → {full_path}")
     return full_path
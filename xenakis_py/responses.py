@@ -0,0 +1,25 @@
+# xenakis_py/responses.py
+"""
+JSON response class shared by the FastAPI servers and demos.
+
+FastAPI's own ORJSONResponse is deprecated in current releases (it warns on
+every response) and needs orjson installed, so this is the one local
+equivalent: orjson's C encoder when available, the stdlib JSONResponse
+otherwise.
+"""
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # optional: C-level JSON encoder
+except ImportError:
+    orjson = None
+
+
+class _ORJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+# Use as FastAPI(default_response_class=FastJSONResponse), or directly
+FastJSONResponse = _ORJSONResponse if orjson is not None else JSONResponse
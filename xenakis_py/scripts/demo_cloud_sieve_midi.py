@@ -1,5 +1,5 @@
-import math
 import time
+import numpy as np
 from xenakis_py.stochastic import (
     StochasticCloud, ProbField, Uniform, Normal, Exponential, Categorical,
     PoissonScheduler, PrintSink, MidiSink
@@ -12,17 +12,21 @@ ALLOWED = sorted(set(
 ))
 
 # ---- Density as a function of time (events/sec) ----
-def density_fn(t_abs: float) -> float:
-    # slow 10s breathing between 0.5 and 6.0 eps
-    x = math.sin(t_abs / 10.0) * 0.5 + 0.5  # 0..1
+def density_fn(t_abs):
+    # slow 10s breathing between 0.5 and 6.0 eps; np.sin so the scheduler
+    # can evaluate a whole batch of candidate times in one call
+    x = np.sin(t_abs / 10.0) * 0.5 + 0.5  # 0..1
     return 0.5 + 5.5 * x
 
-scheduler = PoissonScheduler(density_fn, max_rate=6.0, seed=2025)
+# One root seed; each field draws from its own spawned, independent stream
+sched_ss, pitch_ss, dur_ss, vel_ss, chan_ss = np.random.SeedSequence(2025).spawn(5)
 
-pitch_field   = Normal(mu=66, sigma=12, hold=0.0, hard_clip=(36, 96), seed=1)
-dur_field     = Exponential(lmbda=2.0, hard_clip=(0.05, 2.5), seed=2)   # mean 0.5 s, clipped
-vel_field     = Normal(mu=90, sigma=25, hard_clip=(20, 127), seed=3)
-chan_field    = Categorical(values=[0,1], weights=[3,1], seed=4)        # mostly ch 0, sometimes ch 1
+scheduler = PoissonScheduler(density_fn, max_rate=6.0, seed=sched_ss)
+
+pitch_field   = Normal(mu=66, sigma=12, hold=0.0, hard_clip=(36, 96), seed=pitch_ss)
+dur_field     = Exponential(lmbda=2.0, hard_clip=(0.05, 2.5), seed=dur_ss)   # mean 0.5 s, clipped
+vel_field     = Normal(mu=90, sigma=25, hard_clip=(20, 127), seed=vel_ss)
+chan_field    = Categorical(values=[0,1], weights=[3,1], seed=chan_ss)        # mostly ch 0, sometimes ch 1
 
 cloud = StochasticCloud(
     pitch_field=pitch_field,
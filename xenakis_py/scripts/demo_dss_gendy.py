@@ -1,6 +1,5 @@
 import numpy as np
 import soundfile as sf
-from xenakis_py.render import render_multichannel_to_wav
 
 # Import GendySynth from your DSS module
 from xenakis_py.dss_gendy import GendySynth
@@ -19,18 +18,15 @@ from xenakis_py.render import render_multichannel_to_wav
 # Initialize GendySynth with mock backend
 synth = GendySynth(backend="mock")
 
-# Generate two mono waveforms for stereo output
-
-min_len = min(len(left_waveform), len(right_waveform))
-left_waveform = left_waveform[:min_len]
-right_waveform = right_waveform[:min_len]
-left_waveform = synth.generate(duration=10.0, seed=42)
-right_waveform = synth.generate(duration=10.0, seed=84)
-
-# Stack waveforms into stereo format [samples, channels]
-stereo_waveform = np.stack([left_waveform, right_waveform], axis=-1)
+# Render both channels straight into one preallocated stereo buffer
+# [samples, channels], one seed per channel; the independent channels
+# render on threads since the compiled kernel releases the GIL.
+duration, sr = 10.0, 44100
+seeds = [42, 84]
+stereo_waveform = np.empty((int(duration * sr), len(seeds)), dtype=np.float32)
+synth.generate_channels(stereo_waveform, seeds, sr=sr)
 
 # Export to WAV file
-render_multichannel_to_wav(stereo_waveform, "gendy_stereo_demo.wav", sr=44100)
+render_multichannel_to_wav(stereo_waveform, "gendy_stereo_demo.wav", sr=sr)
 
 print("✅ DSS stereo waveform generated and saved to 'gendy_stereo_demo.wav'")
\ No newline at end of file
@@ -5,15 +5,53 @@ Usage:
 """
 
 import argparse
+import json
+import os
+from functools import lru_cache
 from typing import List
+import numpy as np
 from mido import MidiFile, MidiTrack, Message, MetaMessage, bpm2tempo
 import yaml
 from datetime import datetime
 from xenakis_py.sieve import Sieve  # use the real engine
 
+try:
+    from yaml import CSafeLoader as _Loader  # LibYAML bindings
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 def load_scene(path: str) -> dict:
+    """
+    Load a YAML scene, reusing a JSON sidecar (<scene>.cache.json) while it is
+    at least as new as the YAML file. JSON parses far faster than YAML.
+    Within a process, loads are memoized until the file's mtime changes, so
+    treat the returned dict as read-only.
+    """
+    return _load_scene_cached(path, os.stat(path).st_mtime_ns)
+
+@lru_cache(maxsize=16)
+def _load_scene_cached(path: str, mtime_ns: int) -> dict:
+    # mtime_ns only keys the cache: editing the scene forces a reload
+    cache = path + ".cache.json"
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(path):
+            with open(cache, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass  # no sidecar yet, or a corrupt one: reparse the YAML
+
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        scene = yaml.load(f, Loader=_Loader)
+
+    try:
+        payload = json.dumps(scene)
+        tmp = cache + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, cache)
+    except (OSError, TypeError, ValueError):
+        pass  # read-only scene dir or non-JSON YAML types: just skip the cache
+    return scene
 
 def sieve_from_scene(scene: dict) -> Sieve:
     # scene["sieve"]["clauses"] can use 'residues' (preferred) or legacy 'residue'
@@ -37,18 +75,15 @@ def sieve_from_scene(scene: dict) -> Sieve:
 def generate_sequence(sv: Sieve, length_steps: int, low: int, high: int) -> List[int]:
     # Build a reservoir across at least two periods for variety
     period = max(1, sv.period())
-    ints = sv.generate(0, max(512, period * 2))  # inclusive in your engine
-    if not ints:
+    ints = np.asarray(sv.generate(0, max(512, period * 2)), dtype=np.int64)  # inclusive in your engine
+    if not ints.size:
         return []
     # Turn sparse set into a stepwise sequence by tiling through periods
-    seq = []
-    i = 0
-    while len(seq) < length_steps:
-        seq.append(ints[i % len(ints)] + (i // len(ints)) * period)
-        i += 1
+    q, r = np.divmod(np.arange(length_steps, dtype=np.int64), ints.size)
+    seq = ints[r] + q * period
     # Map to MIDI register
     span = max(1, high - low + 1)
-    return [low + (n % span) for n in seq]
+    return (low + seq % span).tolist()
 
 def write_midi(pitches: List[int], bpm: int, filename: str, channel: int = 0):
     """
@@ -74,17 +109,18 @@ def write_midi(pitches: List[int], bpm: int, filename: str, channel: int = 0):
     track = MidiTrack()
     mid.tracks.append(track)
 
-    # Set tempo
-    tempo = bpm2tempo(bpm)
-    track.insert(0, MetaMessage('set_tempo', tempo=tempo, time=0))
-
     # Note length in ticks (480 tpq default -> 240 = eighth note, 480 = quarter note)
     step_ticks = 480
 
-    # Write notes
+    # Tempo + all notes, built as one list and stored in a single assignment
+    tempo = bpm2tempo(bpm)
+    msgs = [MetaMessage('set_tempo', tempo=tempo, time=0)]
     for note in pitches:
-        track.append(Message('note_on', note=note, velocity=96, time=0, channel=channel))
-        track.append(Message('note_off', note=note, velocity=64, time=step_ticks, channel=channel))
+        msgs += (
+            Message('note_on', note=note, velocity=96, time=0, channel=channel),
+            Message('note_off', note=note, velocity=64, time=step_ticks, channel=channel),
+        )
+    track[:] = msgs
 
     # Save
     mid.save(filename)
@@ -1,13 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
 from pythonosc.udp_client import SimpleUDPClient
 import yaml
+from xenakis_py.osc_bundle import log_send_error, send_bundled
 from pydantic import BaseModel
 
+try:
+    from yaml import CSafeLoader as _Loader  # LibYAML bindings
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # Load scene preset
 with open("../scenes/upic_demo.yaml", "r") as f:
-    scene = yaml.safe_load(f)
+    scene = yaml.load(f, Loader=_Loader)
 
 # OSC setup
 osc_client = SimpleUDPClient(scene["osc"]["host"], scene["osc"]["port"])
@@ -36,13 +45,15 @@ class PointData(BaseModel):
 
 # Drawing-to-sound conversion
 def convert_path_to_sound(path_points, canvas_width, canvas_height, duration=10.0):
-    sound_events = []
-    for x, y in path_points:
-        time = (x / canvas_width) * duration
-        frequency = 200 + (y / canvas_height) * 1800  # Map Y to 200Hz–2000Hz
-        sound_events.append((time, frequency))
+    # (n, 2) array of (time, frequency) rows, computed for all points at once
+    pts = np.asarray(path_points, dtype=np.float64).reshape(-1, 2)
+    sound_events = np.empty_like(pts)
+    sound_events[:, 0] = pts[:, 0] * (duration / canvas_width)
+    sound_events[:, 1] = 200 + pts[:, 1] * (1800 / canvas_height)  # Map Y to 200Hz–2000Hz
     return sound_events
 
+_osc_pool = ThreadPoolExecutor(max_workers=1)  # background sender for /send_path
+
 # Serve canvas UI
 @app.get("/", response_class=HTMLResponse)
 async def get_canvas():
@@ -111,9 +122,13 @@ async def send_path(data: PathData):
         data.height,
         scene["canvas"]["duration"]
     )
-    for time, freq in sound_events:
-        osc_client.send_message(osc_address, [time, freq, data.amplitude, data.glissando_rate, data.density])
-    return "Path sent to SuperCollider"
+    rows = np.empty((len(sound_events), 5))
+    rows[:, :2] = sound_events
+    rows[:, 2:] = (data.amplitude, data.glissando_rate, data.density)
+    # Send off the event loop; one worker keeps paths in submission order
+    fut = asyncio.get_running_loop().run_in_executor(_osc_pool, send_bundled, osc_client, osc_address, rows.tolist())
+    fut.add_done_callback(log_send_error)
+    return "Path queued for SuperCollider"
 @app.post("/point")
 async def point(data: PointData):
     # Map canvas Y → frequency (top = high). Invert if you prefer.
@@ -1,5 +1,5 @@
 # demo_upic_live.py — self-contained UPIC demo with live playback + colour-by-pitch
-# Requires: fastapi, uvicorn, python-osc
+# Requires: fastapi, uvicorn, python-osc, numpy
 #
 # Run:
 #   cd C:\Users\usuario\Documents\PR_xenakis\xenakis_py\scripts
@@ -7,10 +7,16 @@
 #
 # Then open: http://127.0.0.1:8000
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import numpy as np
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
 from pythonosc.udp_client import SimpleUDPClient
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+from xenakis_py.osc_bundle import log_send_error, osc_message, send_bundled
 
 # ---------- OSC config (SuperCollider defaults) ----------
 OSC_HOST = "127.0.0.1"
@@ -40,14 +46,47 @@ class PointData(BaseModel):
 
 # ---------- Helpers ----------
 def convert_path_to_sound(path_pts, w, h, duration=10.0):
-    """Map X→time (0..duration), Y→freq (200..2000 Hz)."""
-    out = []
-    for x, y in path_pts:
-        t = (x / w) * duration
-        f = 200 + (y / h) * 1800
-        out.append((t, f))
+    """Map X→time (0..duration), Y→freq (200..2000 Hz); returns an (n, 2) array."""
+    pts = np.asarray(path_pts, dtype=np.float64).reshape(-1, 2)
+    out = np.empty_like(pts)
+    out[:, 0] = pts[:, 0] * (duration / w)
+    out[:, 1] = 200 + pts[:, 1] * (1800 / h)
     return out
 
+_osc_pool = ThreadPoolExecutor(max_workers=1)  # background sender for /send_path
+log = logging.getLogger(__name__)
+
+# Live /point traffic is coalesced server-side: requests only enqueue, and a
+# background task sends everything that arrived within POINT_WINDOW_S as one
+# bundle. Releases go through the same queue so they never overtake points.
+# The queue lives for the whole process and a failed send is logged, not
+# fatal, so queued messages (releases included) are never thrown away.
+POINT_WINDOW_S = 0.005
+_live_queue: "asyncio.Queue | None" = None
+_live_task: "asyncio.Task | None" = None
+
+async def _flush_live():
+    while True:
+        items = [await _live_queue.get()]
+        await asyncio.sleep(POINT_WINDOW_S)  # let the window fill
+        while not _live_queue.empty():
+            items.append(_live_queue.get_nowait())
+        try:
+            bundle = OscBundleBuilder(IMMEDIATELY)
+            for address, row in items:
+                bundle.add_content(osc_message(address, row))
+            osc.send(bundle.build())
+        except Exception:
+            log.exception("OSC live send failed (%d messages)", len(items))
+
+def _send_live(address, row):
+    global _live_queue, _live_task
+    if _live_queue is None:
+        _live_queue = asyncio.Queue()  # created on the server's event loop
+    if _live_task is None or _live_task.done():
+        _live_task = asyncio.get_running_loop().create_task(_flush_live())
+    _live_queue.put_nowait((address, row))
+
 # ---------- Routes ----------
 @app.get("/", response_class=HTMLResponse)
 async def home():
@@ -216,25 +255,25 @@ async def home():
 @app.post("/send_path")
 async def send_path(data: PathData):
     events = convert_path_to_sound(data.path, data.width, data.height, duration=10.0)
-    for t, f in events:
-        # Batch events → /upic (SC will spawn short notes)
-        osc.send_message("/upic", [t, f, float(data.amplitude),
-                                   float(data.glissando_rate), float(data.density)])
-    return "Path sent to SuperCollider"
+    # Batch events → /upic (SC will spawn short notes)
+    rows = np.empty((len(events), 5))
+    rows[:, :2] = events
+    rows[:, 2:] = (data.amplitude, data.glissando_rate, data.density)
+    # Send off the event loop; one worker keeps paths in submission order
+    fut = asyncio.get_running_loop().run_in_executor(_osc_pool, send_bundled, osc, "/upic", rows.tolist())
+    fut.add_done_callback(log_send_error)
+    return "Path queued for SuperCollider"
 
 @app.post("/point")
 async def point(data: PointData):
     # Live: map Y→freq (top high). Invert by (height - y) if desired.
     freq = 200 + (data.y / data.height) * 1800
-    osc.send_message("/upic_live", [float(freq),
-                                    float(data.amplitude),
-                                    float(data.glissando_rate),
-                                    float(data.density)])
+    _send_live("/upic_live", (freq, data.amplitude, data.glissando_rate, data.density))
     return {"ok": True}
 
 @app.post("/point_release")
 async def point_release():
-    osc.send_message("/upic_live_release", [])
+    _send_live("/upic_live_release", ())
     return {"ok": True}
 
 if __name__ == "__main__":
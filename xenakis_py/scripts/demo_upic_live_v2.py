@@ -1,22 +1,30 @@
 # demo_upic_live_v2.py — UPIC live with scale quantisation, velocity loudness, save/replay
-# Requires: fastapi, uvicorn, python-osc
+# Requires: fastapi, uvicorn, python-osc, numpy (optional: orjson)
 #
 # Run:
 #   cd C:\Users\usuario\Documents\PR_xenakis\xenakis_py\scripts
 #   python demo_upic_live_v2.py
 # Then open: http://127.0.0.1:8000
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+import asyncio
+from collections import deque
+import hashlib
+import logging
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel
 from pythonosc.udp_client import SimpleUDPClient
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+from xenakis_py.osc_bundle import osc_message, send_bundled
+from xenakis_py.responses import FastJSONResponse
 import math
+import numpy as np
 
 OSC_HOST = "127.0.0.1"
 OSC_PORT = 57120
 osc = SimpleUDPClient(OSC_HOST, OSC_PORT)
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)  # orjson for the high-rate /point replies
 
 A4 = 440.0
 
@@ -42,38 +50,47 @@ TONICS = {
     "F#":6, "Gb":6, "G":7, "G#":8, "Ab":8, "A":9, "A#":10, "Bb":10, "B":11
 }
 
+# Equal-tempered pitch of every MIDI note, so quantised output is a lookup
+_ST_HZ = [A4 * 2.0 ** ((n - 69) / 12.0) for n in range(128)]
+
 def hz_to_semitones(freq: float, ref=A4) -> float:
     return 12.0 * math.log2(max(freq, 1e-9) / ref)
 
 def semitones_to_hz(st: float, ref=A4) -> float:
+    # Table only for whole semitones on the MIDI range; bends, glides and
+    # out-of-range values take the exact formula
+    if ref == A4 and -69 <= st <= 58 and st == int(st):
+        return _ST_HZ[int(st) + 69]
     return ref * (2.0 ** (st / 12.0))
 
+def _nearest_deltas(mask: int):
+    """Per chroma 0..11, the semitone nudge to the closest allowed chroma in the
+    12-bit mask (0 when already allowed; ties go downward)."""
+    deltas = []
+    for chroma in range(12):
+        best = min((d for d in range(-12, 13) if mask >> ((chroma + d) % 12) & 1),
+                   key=abs)
+        deltas.append(best)
+    return deltas
+
+# Allowed chromas and nearest-degree nudges depend only on (scale, tonic), so
+# they are tabulated once instead of rescanned on every live point
+_ALLOWED_MASK = {
+    (scale, tonic): sum(1 << ((d + t) % 12) for d in set(degrees))
+    for scale, degrees in SCALES.items() if degrees is not None
+    for tonic, t in TONICS.items()
+}
+_NEAREST = {key: _nearest_deltas(mask) for key, mask in _ALLOWED_MASK.items()}
+_ST_HZ_ARR = np.array(_ST_HZ)
+
 def quantise_freq(freq: float, scale_name: str, tonic_name: str) -> float:
     """Snap freq to nearest degree of chosen scale relative to tonic. If scale is None, return freq."""
-    degrees = SCALES.get(scale_name, None)
-    if degrees is None:
+    if SCALES.get(scale_name, None) is None:
         return freq
-    tonic = TONICS.get(tonic_name, 0)
-    n = hz_to_semitones(freq)         # rel to A4
-    # Convert to absolute chroma (0..11) w.r.t C = 0
-    # Find nearest semitone q
-    q = round(n)
-    # Compute chroma with C=0
-    chroma = (q % 12)
-    # Shift scale degrees by tonic to get absolute chroma set
-    allowed = [ (d + tonic) % 12 for d in degrees ]
-    # If already allowed, keep q; else nudge q up/down to closest allowed chroma
-    if chroma not in allowed:
-        # search nearest delta in semitone steps up to +/-6
-        best_q = q
-        best_dist = 999
-        for delta in range(-12,13):
-            test = (q + delta) % 12
-            if test in allowed and abs(delta) < best_dist:
-                best_dist = abs(delta)
-                best_q = q + delta
-        q = best_q
-    return semitones_to_hz(q)
+    deltas = _NEAREST.get((scale_name, tonic_name)) or _NEAREST[(scale_name, "C")]
+    # Find nearest semitone q (rel to A4), then nudge it onto the scale
+    q = round(hz_to_semitones(freq))
+    return semitones_to_hz(q + deltas[q % 12])
 
 # ---------- Models ----------
 class PathData(BaseModel):
@@ -104,25 +121,75 @@ def y_to_freq(y: float, height: int, invert: bool) -> float:
     yy = (height - y) if invert else y
     return 200.0 + (yy / max(height,1)) * 1800.0  # 200–2000 Hz
 
-def convert_path_to_sound(path_pts, w, h, duration=10.0, invert=False, scale="Continuous (no quantise)", tonic="C"):
-    """Map X→time, Y→freq, with optional quantisation."""
-    out = []
-    for x, y in path_pts:
-        t = (x / max(w,1)) * duration
-        f = y_to_freq(y, h, invert)
-        f = quantise_freq(f, scale, tonic)
-        out.append((t, f))
+def quantise_freqs(fs: np.ndarray, scale_name: str, tonic_name: str) -> np.ndarray:
+    """Vectorised quantise_freq over an array of frequencies."""
+    if SCALES.get(scale_name, None) is None:
+        return fs
+    deltas = _NEAREST.get((scale_name, tonic_name)) or _NEAREST[(scale_name, "C")]
+    q = np.round(12.0 * np.log2(np.maximum(fs, 1e-9) / A4)).astype(np.int64)
+    q += np.asarray(deltas)[q % 12]
+    idx = q + 69
+    out = _ST_HZ_ARR[np.clip(idx, 0, 127)]
+    in_range = (idx >= 0) & (idx <= 127)
+    if not in_range.all():
+        out = np.where(in_range, out, A4 * 2.0 ** (q / 12.0))
     return out
 
-# ---------- Routes ----------
-@app.get("/", response_class=HTMLResponse)
-async def home():
+def convert_path_to_sound(path_pts, w, h, duration=10.0, invert=False, scale="Continuous (no quantise)", tonic="C"):
+    """Map X→time, Y→freq, with optional quantisation."""
+    xs, ys = np.asarray(path_pts, dtype=np.float64).reshape(-1, 2).T
+    ts = (xs / max(w,1)) * duration
+    yy = (h - ys) if invert else ys
+    fs = quantise_freqs(200.0 + (yy / max(h,1)) * 1800.0, scale, tonic)
+    return list(zip(ts.tolist(), fs.tolist()))
+
+# Live /point traffic is queued for one writer task, so requests never wait on
+# sendto. Past LIVE_QUEUE_SIZE pending messages the oldest point update is
+# dropped (for a point stream only the latest position matters); releases are
+# never dropped, and share the queue so they never overtake points. A failed
+# send is logged and the writer keeps running.
+LIVE_QUEUE_SIZE = 256
+log = logging.getLogger(__name__)
+LIVE_POINT_ADDR = "/upic_live"
+_live_pending: "deque[tuple]" = deque()
+_live_ready: "asyncio.Event | None" = None
+_live_task: "asyncio.Task | None" = None
+
+async def _drain_live():
+    while True:
+        await _live_ready.wait()
+        _live_ready.clear()
+        items = list(_live_pending)
+        _live_pending.clear()
+        try:
+            bundle = OscBundleBuilder(IMMEDIATELY)
+            for address, row in items:
+                bundle.add_content(osc_message(address, row))
+            osc.send(bundle.build())
+        except Exception:
+            log.exception("OSC live send failed (%d messages)", len(items))
+
+def _send_live(address, row):
+    global _live_ready, _live_task
+    if _live_task is None or _live_task.done():
+        _live_ready = asyncio.Event()
+        _live_task = asyncio.get_running_loop().create_task(_drain_live())
+    if len(_live_pending) >= LIVE_QUEUE_SIZE:
+        for i, (queued, _) in enumerate(_live_pending):
+            if queued == LIVE_POINT_ADDR:
+                del _live_pending[i]
+                break
+    _live_pending.append((address, row))
+    _live_ready.set()
+
+# ---------- Page ----------
+def _render_home() -> str:
     # One-page UI
     # (Note: backslashes in regex are escaped in the Python triple-quoted string)
     scale_options = "".join([f'<option value="{name}">{name}</option>' for name in SCALES.keys()])
     tonic_options = "".join([f'<option value="{name}">{name}</option>' for name in ["C","C#","D","D#","E","F","F#","G","G#","A","A#","B"]])
 
-    return HTMLResponse(f"""
+    return f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -348,7 +415,18 @@ async def home():
   </script>
 </body>
 </html>
-    """)
+    """
+
+# The page only depends on SCALES, so it is rendered and hashed once
+_HTML_BYTES = _render_home().encode("utf-8")
+_HTML_ETAG = '"%s"' % hashlib.sha1(_HTML_BYTES).hexdigest()
+
+# ---------- Routes ----------
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    if request.headers.get("if-none-match") == _HTML_ETAG:
+        return Response(status_code=304, headers={"ETag": _HTML_ETAG})
+    return HTMLResponse(content=_HTML_BYTES, headers={"ETag": _HTML_ETAG})
 
 @app.post("/send_path")
 async def send_path(data: PathData):
@@ -356,25 +434,21 @@ async def send_path(data: PathData):
         data.path, data.width, data.height, duration=10.0,
         invert=data.invert_y, scale=data.scale, tonic=data.tonic
     )
-    for t, f in events:
-        # Batch events → /upic (SC spawns short notes)
-        osc.send_message("/upic", [t, f, float(data.amplitude),
-                                   float(data.glissando_rate), float(data.density)])
+    # Batch events → /upic (SC spawns short notes)
+    extra = (data.amplitude, data.glissando_rate, data.density)
+    send_bundled(osc, "/upic", [(t, f) + extra for t, f in events])
     return "Path sent to SuperCollider"
 
 @app.post("/point")
 async def point(data: PointData):
     raw = y_to_freq(data.y, data.height, data.invert_y)
     freq = quantise_freq(raw, data.scale, data.tonic)
-    osc.send_message("/upic_live", [float(freq),
-                                    float(data.amplitude),
-                                    float(data.glissando_rate),
-                                    float(data.density)])
+    _send_live(LIVE_POINT_ADDR, (freq, data.amplitude, data.glissando_rate, data.density))
     return {"ok": True}
 
 @app.post("/point_release")
 async def point_release():
-    osc.send_message("/upic_live_release", [])
+    _send_live("/upic_live_release", ())
     return {"ok": True}
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
-import math
 import time
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 from mido import Message, MidiFile, MidiTrack, MetaMessage, bpm2tempo
 from xenakis_py.stochastic import (
     StochasticCloud, Normal, Exponential, Categorical, PoissonScheduler
@@ -13,8 +14,9 @@ ALLOWED = sorted(set(
     [36,38,41,42,45,47,48,50,53,54,57,59,60,62,65,66,69,71,72,74,77,78,81,83,84,86,89,90,93,95]
 ))
 
-def density_fn(t_abs: float) -> float:
-    x = math.sin(t_abs / 10.0) * 0.5 + 0.5
+def density_fn(t_abs):
+    # np.sin accepts a scalar or the scheduler's whole array of candidate times
+    x = np.sin(t_abs / 10.0) * 0.5 + 0.5
     return 0.5 + 5.5 * x
 
 def build_cloud(seed: int = 99) -> StochasticCloud:
@@ -38,15 +40,10 @@ def build_cloud(seed: int = 99) -> StochasticCloud:
     )
 
 def generate_events_offline(cloud: StochasticCloud, duration_s: float):
+    # Whole window at once: thinned arrival times, then every field as arrays
     t = time.time()
-    end = t + duration_s
-    events = []
-    while True:
-        t = cloud.scheduler.next_time(t)
-        if t > end:
-            break
-        events.append(cloud.draw_event(now=t))
-    return events
+    times = cloud.scheduler.generate_batch(t, t + duration_s)
+    return cloud.draw_events(times)
 
 def seconds_to_ticks(seconds, ticks_per_beat, tempo):
     return int(round(seconds * (ticks_per_beat * (1_000_000 / tempo))))
@@ -60,37 +57,39 @@ def export_to_midi(events, out_path, bpm=120, ticks_per_beat=480, separate_track
     meta.append(MetaMessage('set_tempo', tempo=tempo, time=0))
     mid.tracks.append(meta)
 
-    timed_msgs = []
+    # Note-on/off times as arrays: ons are rows [0, n), offs rows [n, 2n)
+    n = len(events)
     t0_ref = events[0].t0 if events else 0.0
-    for ev in events:
-        start_s = ev.t0 - t0_ref
-        end_s = start_s + ev.dur_s
-        timed_msgs.append((start_s, ev.channel, Message('note_on', note=ev.pitch, velocity=ev.vel, channel=ev.channel)))
-        timed_msgs.append((end_s,   ev.channel, Message('note_off', note=ev.pitch, velocity=0, channel=ev.channel)))
-
-    timed_msgs.sort(key=lambda x: (x[0], 0 if x[2].type == 'note_off' else 1))
-
+    start_s = np.array([ev.t0 for ev in events], dtype=np.float64) - t0_ref
+    end_s = start_s + np.array([ev.dur_s for ev in events], dtype=np.float64)
+    abs_times = np.concatenate([start_s, end_s])
+    is_on = np.repeat([1, 0], n)
+    channels = np.tile(np.array([ev.channel for ev in events], dtype=np.int64), 2)
+
+    # Stable sort by (time, note_off first); ties keep event order
+    order = np.lexsort((is_on, abs_times))
+    abs_times, is_on, channels = abs_times[order], is_on[order], channels[order]
+    ev_idx = (order % n).tolist() if n else []
+
+    # Delta ticks per track in one shot (each delta rounded, as before)
+    k = ticks_per_beat * (1_000_000 / tempo)
     if separate_tracks_by_channel:
-        tracks = {}
-        last_time_by_channel = {}
-        for abs_time_s, ch, msg in timed_msgs:
-            if ch not in tracks:
-                tracks[ch] = MidiTrack()
-                mid.tracks.append(tracks[ch])
-                last_time_by_channel[ch] = 0.0
-            dt = abs_time_s - last_time_by_channel[ch]
-            msg.time = seconds_to_ticks(dt, ticks_per_beat, tempo)
-            tracks[ch].append(msg)
-            last_time_by_channel[ch] = abs_time_s
+        _, first = np.unique(channels, return_index=True)
+        groups = [channels == channels[i] for i in np.sort(first)]
     else:
+        groups = [np.ones(len(abs_times), dtype=bool)]
+
+    for mask in groups:
         track = MidiTrack()
         mid.tracks.append(track)
-        last_time = 0.0
-        for abs_time_s, ch, msg in timed_msgs:
-            dt = abs_time_s - last_time
-            msg.time = seconds_to_ticks(dt, ticks_per_beat, tempo)
-            track.append(msg)
-            last_time = abs_time_s
+        idx = np.flatnonzero(mask)
+        ticks = np.rint(np.diff(abs_times[idx], prepend=0.0) * k).astype(np.int64)
+        for i, dt in zip(idx.tolist(), ticks.tolist()):
+            ev = events[ev_idx[i]]
+            if is_on[i]:
+                track.append(Message('note_on', note=ev.pitch, velocity=ev.vel, channel=ev.channel, time=dt))
+            else:
+                track.append(Message('note_off', note=ev.pitch, velocity=0, channel=ev.channel, time=dt))
 
     mid.save(out_path)
     return Path(out_path)
@@ -14,8 +14,50 @@ References:
 """
 
 import math
+from functools import lru_cache, reduce
+import numpy as np
 from typing import List, Tuple, Dict, Union
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; _mask folds NumPy masks instead
+    njit = None
+
+# Largest period whose membership pattern is precomputed at construction
+_PERIOD_TABLE_LIMIT = 1 << 20
+
+# Smallest universe handed to the compiled mask kernel; below this the call
+# overhead outweighs the saved temporaries
+_KERNEL_MIN_SIZE = 1 << 14
+
+_OP_CODES = {'union': 0, 'intersection': 1, 'complement': 2}
+
+def _mask_core(xs, ops, moduli, tables, offsets, result):
+    # Same fold as Sieve._mask, one clause at a time without temporaries;
+    # `nonempty` tracks result.any() for the empty-result rule
+    nonempty = False
+    for c in range(ops.shape[0]):
+        op = ops[c]
+        if op < 0:
+            continue
+        m = moduli[c]
+        base = offsets[c]
+        found = False
+        for i in range(xs.shape[0]):
+            hit = tables[base + xs[i] % m]
+            if op == 0:
+                v = result[i] or hit
+            elif op == 1:
+                v = (result[i] and hit) if nonempty else hit
+            else:
+                v = (result[i] and not hit) if nonempty else not hit
+            result[i] = v
+            found = found or v
+        nonempty = found
+    return result
+
+_mask_kernel = njit(cache=True, nogil=True)(_mask_core) if njit is not None else None
+
 class Sieve:
     def __init__(self, clauses: List[Tuple[str, Dict[str, Union[int, List[int]]]]]):
         """
@@ -26,6 +68,8 @@ class Sieve:
         """
         self.clauses = []
         self.shift_amount = 0
+        # One bool lookup table per clause: table[x % m] is membership, no isin()
+        tables = []
 
         for op, clause in clauses:
             modulus = clause.get('modulus')
@@ -34,12 +78,40 @@ class Sieve:
             if not isinstance(modulus, int) or modulus < 2:
                 raise ValueError(f"Invalid modulus: {modulus}. Must be integer ≥ 2.")
 
-            # Normalize residues to 0…m−1, remove None and duplicates
-            normalized = sorted(set(r % modulus for r in residues if r is not None))
+            # Normalize residues to 0…m−1 in a byte table; None is skipped and
+            # duplicates collapse, so reading it back gives the sorted residues
+            hits = bytearray(modulus)
+            for r in residues:
+                if r is not None:
+                    hits[r % modulus] = 1
+            table = np.frombuffer(hits, dtype=np.uint8).astype(bool)
+            normalized = np.flatnonzero(table).tolist()
             if not normalized:
                 raise ValueError(f"Residue list for modulus {modulus} is empty after normalization.")
 
             self.clauses.append((op, {'modulus': modulus, 'residues': normalized}))
+            tables.append(table)
+
+        # Clauses are fixed after construction: precompute what generate() needs
+        self._moduli = tuple(clause['modulus'] for _, clause in self.clauses)
+        self._tables = tuple(tables)
+        # The same clauses flattened for _mask_kernel
+        self._ops = np.array([_OP_CODES.get(op, -1) for op, _ in self.clauses], dtype=np.int8)
+        self._moduli_arr = np.array(self._moduli, dtype=np.int64)
+        self._table_flat = np.concatenate(tables) if tables else np.zeros(0, dtype=bool)
+        self._table_ofs = np.cumsum([0] + list(self._moduli[:-1])).astype(np.int64)
+        self._period = reduce(math.lcm, self._moduli, 1)
+
+        # Members of one full period [0, P) at shift 0, evaluated once. It does
+        # not depend on shift, so shift() keeps it; windows covering a period
+        # just tile it. Very long periods are evaluated per query instead.
+        self._base = None
+        if self._period <= _PERIOD_TABLE_LIMIT:
+            self._base = np.flatnonzero(self._mask(np.arange(self._period, dtype=np.int64)))
+
+        # Per-instance memo of generate(); shift is part of the key, so
+        # shift() never serves stale results
+        self._generate_cached = lru_cache(maxsize=64)(self._generate_impl)
 
     def generate(self, start: int, end: int) -> List[int]:
         """
@@ -54,22 +126,50 @@ class Sieve:
         Returns:
         - List of integers satisfying the sieve
         """
-        universe = set(range(start, end + 1))
-        result_set = set()
+        return list(self._generate_cached(start, end, self.shift_amount))
+
+    def _generate_impl(self, start: int, end: int, shift: int) -> Tuple[int, ...]:
+        period = self.period()
+        if end - start + 1 < period or self._base is None:
+            universe = np.arange(start, end + 1, dtype=np.int64)
+            return tuple(universe[self._mask(universe - shift)].tolist())
+
+        # The window covers a full period, so membership is the base pattern
+        # tiled across it (the clause rules see the same period either way).
+        lo = start - shift
+        hi = end - shift
+        ks = np.arange(lo // period, hi // period + 1, dtype=np.int64)
+        candidates = np.add.outer(ks * period, self._base).ravel()
+        candidates = candidates[(candidates >= lo) & (candidates <= hi)]
+        return tuple((candidates + shift).tolist())
+
+    def _mask(self, xs: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the clauses over already-shifted values xs, returning a boolean mask.
+        """
+        result = np.zeros(xs.shape, dtype=bool)
+        if _mask_kernel is not None and xs.size >= _KERNEL_MIN_SIZE:
+            return _mask_kernel(xs, self._ops, self._moduli_arr, self._table_flat, self._table_ofs, result)
 
-        for op, clause in self.clauses:
-            modulus = clause['modulus']
-            residues = clause['residues']
-            filtered = {x for x in universe if ((x - self.shift_amount) % modulus) in residues}
+        # Masks are folded in place; an empty running result takes the clause as-is
+        for (op, _), modulus, table in zip(self.clauses, self._moduli, self._tables):
+            filtered = table[xs % modulus]
 
             if op == 'union':
-                result_set |= filtered
+                result |= filtered
             elif op == 'intersection':
-                result_set = filtered if not result_set else (result_set & filtered)
+                if result.any():
+                    result &= filtered
+                else:
+                    result = filtered
             elif op == 'complement':
-                result_set = universe - filtered if not result_set else result_set - filtered
+                np.logical_not(filtered, out=filtered)
+                if result.any():
+                    result &= filtered
+                else:
+                    result = filtered
 
-        return sorted(result_set)
+        return result
 
     def period(self) -> int:
         """
@@ -79,8 +179,7 @@ class Sieve:
         Returns:
         - Integer period of the sieve
         """
-        moduli = [clause['modulus'] for _, clause in self.clauses]
-        return math.lcm(*moduli)
+        return self._period
 
     def shift(self, amount: int):
         """
@@ -1,14 +1,28 @@
 from __future__ import annotations
 import math
 import random
+import sys
+from bisect import bisect_left
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union, Dict
 
+import numpy as np
+
 Number = Union[int, float]
+Seed = Union[int, np.random.SeedSequence, None]
 
 # ---------- Utility distributions ----------
 
+def make_rngs(seed: Seed) -> Tuple[random.Random, np.random.Generator]:
+    """
+    Scalar + batch generators from one seed. Pass children of a single
+    SeedSequence (ss.spawn(n)) to give each field an independent stream.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return random.Random(int(seed.generate_state(1)[0])), np.random.default_rng(seed)
+    return random.Random(seed), np.random.default_rng(seed)
+
 def clamp(x: Number, lo: Number, hi: Number) -> Number:
     return lo if x < lo else hi if x > hi else x
 
@@ -38,21 +52,24 @@ def draw_categorical(weights: Sequence[float], values: Sequence[Number], rng: ra
 class ProbField:
     """
     A draw() -> value callable with optional S&H (sample-hold) and jitter.
+    batch_fn(gen, n) optionally draws n values at once for sample_n().
     """
     def __init__(
         self,
         fn: Callable[[random.Random], float],
         *,
+        batch_fn: Optional[Callable[[np.random.Generator, int], np.ndarray]] = None,
         hold: Optional[float] = None,     # seconds to hold last value
         jitter: float = 0.0,              # additive uniform +-jitter
         hard_clip: Optional[Tuple[float, float]] = None,
-        seed: Optional[int] = None
+        seed: Seed = None
     ):
         self.fn = fn
+        self.batch_fn = batch_fn
         self.hold = hold
         self.jitter = jitter
         self.clip = hard_clip
-        self.rng = random.Random(seed)
+        self.rng, self.np_rng = make_rngs(seed)
         self._last_val: Optional[float] = None
         self._last_t: float = -1e9
 
@@ -70,36 +87,70 @@ class ProbField:
             val += self.rng.uniform(-self.jitter, +self.jitter)
         # clip
         if self.clip:
-            val = clamp(val, self.clip[0], self.clip[1])
+            lo, hi = self.clip
+            val = lo if val < lo else hi if val > hi else val
         return val
 
+    def draw_many(self, n: int, now: Optional[float] = None) -> np.ndarray:
+        """
+        n draws at one instant from the numpy Generator (a held field repeats).
+        """
+        now = time.time() if now is None else now
+        return self.sample_n(np.full(n, now))
+
+    def sample_n(self, times) -> np.ndarray:
+        """
+        draw() for a whole array of event times. Fields with a non-zero
+        sample-hold (or without a batch_fn) fall back to sequential draws.
+        """
+        times = np.asarray(times, dtype=float)
+        if self.batch_fn is None or self.hold:
+            return np.fromiter((self.draw(t) for t in times.tolist()), dtype=float, count=times.size)
+        vals = np.asarray(self.batch_fn(self.np_rng, times.size), dtype=float)
+        if self.jitter:
+            vals += self.np_rng.uniform(-self.jitter, +self.jitter, size=vals.size)
+        if self.clip:
+            np.clip(vals, self.clip[0], self.clip[1], out=vals)
+        if vals.size:
+            self._last_val = float(vals[-1])
+            self._last_t = float(times[-1])
+        return vals
+
 # Convenience builders
 def Uniform(a: Number, b: Number, **kw) -> ProbField:
-    return ProbField(lambda rng: draw_uniform(a, b, rng), **kw)
+    return ProbField(lambda rng: draw_uniform(a, b, rng),
+                     batch_fn=lambda gen, n: gen.uniform(a, b, n), **kw)
 
 def Normal(mu: Number, sigma: Number, **kw) -> ProbField:
-    return ProbField(lambda rng: draw_normal(mu, sigma, rng), **kw)
+    return ProbField(lambda rng: draw_normal(mu, sigma, rng),
+                     batch_fn=lambda gen, n: gen.normal(mu, sigma, n), **kw)
 
 def Exponential(lmbda: Number, **kw) -> ProbField:
-    return ProbField(lambda rng: draw_exponential(lmbda, rng), **kw)
+    return ProbField(lambda rng: draw_exponential(lmbda, rng),
+                     batch_fn=lambda gen, n: gen.exponential(1.0 / lmbda, n), **kw)
 
 def Categorical(values: Sequence[Number], weights: Optional[Sequence[float]] = None, **kw) -> ProbField:
     if weights is None:
         weights = [1.0] * len(values)
     values = list(values)
     weights = list(weights)
-    return ProbField(lambda rng: draw_categorical(weights, values, rng), **kw)
+    p = np.asarray(weights, dtype=float) / sum(weights)
+    return ProbField(lambda rng: draw_categorical(weights, values, rng),
+                     batch_fn=lambda gen, n: gen.choice(values, size=n, p=p), **kw)
 
 # ---------- Event model ----------
 
-@dataclass
+# Slotted on 3.10+ (no per-event __dict__); plain dataclass on 3.9
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class CloudEvent:
     t0: float            # absolute time (s, epoch) the event should start
     pitch: int           # MIDI pitch 0..127
     dur_s: float         # seconds
     vel: int             # MIDI velocity 1..127
     channel: int = 0     # MIDI channel 0..15
-    meta: Dict = field(default_factory=dict)
+    meta: Optional[Dict] = None  # free-form annotations; no dict per event unless set
 
 # ---------- Density / timing (Poisson process) ----------
 
@@ -109,20 +160,74 @@ class PoissonScheduler:
     - density_fn returns expected events per second at time 't'.
     - max_rate is an upper bound of density_fn over the run window.
     """
-    def __init__(self, density_fn: Callable[[float], float], max_rate: float, seed: Optional[int] = None):
+    # Candidate arrivals drawn per refill of the next_time() buffer
+    AHEAD_BLOCK = 64
+
+    def __init__(self, density_fn: Callable[[float], float], max_rate: float, seed: Seed = None):
         assert max_rate > 0.0
         self.density_fn = density_fn
         self.max_rate = max_rate
-        self.rng = random.Random(seed)
+        self.rng, self.np_rng = make_rngs(seed)
+        # Accepted arrivals thinned ahead of time for chained next_time() calls
+        self._ahead: List[float] = []
+        self._ahead_i = 0
+        self._ahead_prev: Optional[float] = None
+        self._ahead_end = 0.0
 
     def next_time(self, t: float) -> float:
-        # Lewis-Shedler thinning
-        while True:
-            w = self.rng.expovariate(self.max_rate)
-            t = t + w
-            u = self.rng.random()
-            if u <= (self.density_fn(t) / self.max_rate):
+        """
+        First event after t (Lewis-Shedler thinning). Candidates are thinned a
+        block at a time; chained calls (t = previous result) pop from that
+        block, any other t starts afresh (memorylessness keeps this exact).
+        """
+        if t == self._ahead_prev:
+            if self._ahead_i < len(self._ahead):
+                t = self._ahead[self._ahead_i]
+                self._ahead_i += 1
+                self._ahead_prev = t
                 return t
+            # Block used up: resume after its last candidate, since rejected
+            # candidates past the last accepted one have already been scanned
+            t = self._ahead_end
+        while True:
+            ts = t + np.cumsum(self.np_rng.exponential(1.0 / self.max_rate, size=self.AHEAD_BLOCK))
+            keep = self.np_rng.random(ts.size) <= self._density(ts) / self.max_rate
+            if keep.any():
+                break
+            t = float(ts[-1])
+        self._ahead = ts[keep].tolist()
+        self._ahead_end = float(ts[-1])
+        self._ahead_i = 1
+        self._ahead_prev = self._ahead[0]
+        return self._ahead[0]
+
+    def generate_batch(self, t0: float, t1: float) -> np.ndarray:
+        """
+        All event times in (t0, t1) at once: max_rate inter-arrivals are cumsum'd
+        to absolute times and thinned with one vectorized compare.
+        """
+        if not t1 > t0:
+            return np.empty(0)
+        n = int(self.max_rate * (t1 - t0) * 1.5) + 16
+        chunks, t = [], t0
+        while t < t1:
+            ts = t + np.cumsum(self.np_rng.exponential(1.0 / self.max_rate, size=n))
+            chunks.append(ts)
+            t = ts[-1]
+        ts = np.concatenate(chunks)
+        ts = ts[ts < t1]
+        keep = self.np_rng.random(ts.size) <= self._density(ts) / self.max_rate
+        return ts[keep]
+
+    def _density(self, ts: np.ndarray) -> np.ndarray:
+        # density_fn may be written for scalars only (e.g. math.sin)
+        try:
+            lam = np.asarray(self.density_fn(ts), dtype=float)
+            if lam.shape == ts.shape:
+                return lam
+        except (TypeError, ValueError):
+            pass
+        return np.fromiter(map(self.density_fn, ts.tolist()), dtype=float, count=ts.size)
 
 # ---------- Stochastic Cloud engine ----------
 
@@ -142,7 +247,7 @@ class StochasticCloud:
         allowed_pitches: Optional[Iterable[int]] = None,
         pitch_quantise: bool = True,
         pitch_span: Tuple[int, int] = (0, 127),
-        seed: Optional[int] = None,
+        seed: Seed = None,
     ):
         self.pitch_field = pitch_field
         self.dur_field = dur_field
@@ -152,64 +257,64 @@ class StochasticCloud:
         self.allowed_pitches = sorted(set(allowed_pitches)) if allowed_pitches is not None else None
         self.pitch_quantise = pitch_quantise
         self.pitch_span = pitch_span
-        self.rng = random.Random(seed)
+        self._allowed_arr = np.asarray(self.allowed_pitches, dtype=np.int64) if self.allowed_pitches else None
+        self.rng = make_rngs(seed)[0]
 
     # --- helpers ---
     def _quantise_pitch(self, p: float) -> int:
         pi = int(round(p))
-        pi = clamp(pi, self.pitch_span[0], self.pitch_span[1])
-        if self.allowed_pitches is None or not self.pitch_quantise:
-            return int(pi)
-        # snap to nearest allowed pitch (in MIDI space)
-        ap = self.allowed_pitches
-        # early outs
-        if pi <= ap[0]: return ap[0]
-        if pi >= ap[-1]: return ap[-1]
-        # binary search
-        lo, hi = 0, len(ap) - 1
-        while lo <= hi:
-            mid = (lo + hi) // 2
-            if ap[mid] < pi:
-                lo = mid + 1
-            else:
-                hi = mid - 1
-        # lo is first >= pi
-        idxs = [max(0, lo - 1), min(len(ap) - 1, lo)]
-        return min(idxs, key=lambda i: abs(ap[i] - pi))  # return index
-        # OOPS! The above returns index; fix below.
-
-    def _quantise_pitch(self, p: float) -> int:  # override with correct return
-        pi = int(round(p))
-        pi = int(clamp(pi, self.pitch_span[0], self.pitch_span[1]))
+        lo, hi = self.pitch_span
+        pi = int(lo if pi < lo else hi if pi > hi else pi)
         if self.allowed_pitches is None or not self.pitch_quantise:
             return pi
         ap = self.allowed_pitches
         # fast bounds
         if pi <= ap[0]: return ap[0]
         if pi >= ap[-1]: return ap[-1]
-        # nearest
-        # - find insertion point
-        lo, hi = 0, len(ap)
-        while lo < hi:
-            mid = (lo + hi) // 2
-            if ap[mid] < pi:
-                lo = mid + 1
-            else:
-                hi = mid
-        # candidates ap[lo-1], ap[lo]
-        a = ap[lo - 1]
-        b = ap[lo] if lo < len(ap) else ap[-1]
-        return a if abs(a - pi) <= abs(b - pi) else b
+        # nearest: candidates either side of the insertion point. bisect is
+        # the scalar counterpart of np.searchsorted used by _quantise_pitches
+        lo = bisect_left(ap, pi)
+        a, b = ap[lo - 1], ap[lo]
+        return a if pi - a <= b - pi else b
+
+    def _quantise_pitches(self, ps: np.ndarray) -> np.ndarray:
+        # array version of _quantise_pitch (ties snap down, like the scalar one)
+        pi = np.clip(np.rint(ps), self.pitch_span[0], self.pitch_span[1]).astype(np.int64)
+        ap = self._allowed_arr
+        if ap is None or not self.pitch_quantise:
+            return pi
+        if ap.size == 1:
+            return np.full_like(pi, ap[0])
+        idx = np.clip(np.searchsorted(ap, pi), 1, ap.size - 1)
+        a, b = ap[idx - 1], ap[idx]
+        return np.where(pi - a <= b - pi, a, b)
 
     # --- main draw ---
     def draw_event(self, now: Optional[float] = None) -> CloudEvent:
         now = time.time() if now is None else now
         pitch = self._quantise_pitch(self.pitch_field.draw(now))
         dur_s = max(0.01, float(self.dur_field.draw(now)))
-        vel = int(clamp(round(self.vel_field.draw(now)), 1, 127))
-        ch = int(clamp(round(self.chan_field.draw(now)), 0, 15))
+        # clamp() inlined on this per-event path
+        vel = round(self.vel_field.draw(now))
+        vel = 1 if vel < 1 else 127 if vel > 127 else vel
+        ch = round(self.chan_field.draw(now))
+        ch = 0 if ch < 0 else 15 if ch > 15 else ch
         t0 = now  # caller can schedule in real-time using PoissonScheduler.next_time()
-        return CloudEvent(t0=t0, pitch=pitch, dur_s=dur_s, vel=vel, channel=ch)
+        return CloudEvent(t0=t0, pitch=pitch, dur_s=dur_s, vel=int(vel), channel=int(ch))
+
+    def draw_events(self, times) -> List[CloudEvent]:
+        """
+        Batched draw_event(): one event per start time, fields sampled as arrays.
+        """
+        times = np.asarray(times, dtype=float)
+        pitch = self._quantise_pitches(self.pitch_field.sample_n(times))
+        dur_s = np.maximum(0.01, self.dur_field.sample_n(times))
+        vel = np.clip(np.rint(self.vel_field.sample_n(times)), 1, 127).astype(np.int64)
+        ch = np.clip(np.rint(self.chan_field.sample_n(times)), 0, 15).astype(np.int64)
+        return [
+            CloudEvent(t0=t, pitch=p, dur_s=d, vel=v, channel=c)
+            for t, p, d, v, c in zip(times.tolist(), pitch.tolist(), dur_s.tolist(), vel.tolist(), ch.tolist())
+        ]
 
     # --- realtime run loop ---
     def run(
@@ -221,9 +326,12 @@ class StochasticCloud:
         max_events: Optional[int] = None,
         time_provider: Callable[[], float] = time.time,
         sleeper: Callable[[float], None] = time.sleep,
+        batch_s: float = 10.0,
     ):
         """
         Realtime loop: schedules events via Poisson thinning and delivers to sink.
+        Events are pre-drawn in windows of batch_s seconds; only the
+        sleep/deliver step runs per event.
         """
         t = time_provider() if t_start is None else t_start
         n = 0
@@ -232,14 +340,18 @@ class StochasticCloud:
                 break
             if max_events is not None and n >= max_events:
                 break
-            t = self.scheduler.next_time(t)
-            # sleep until t
-            dt = t - time_provider()
-            if dt > 0:
-                sleeper(dt)
-            ev = self.draw_event(now=t)
-            sink.handle(ev)
-            n += 1
+            t_next = t + batch_s if t_end is None else min(t + batch_s, t_end)
+            events = self.draw_events(self.scheduler.generate_batch(t, t_next))
+            if max_events is not None:
+                events = events[:max_events - n]
+            for ev in events:
+                # sleep until ev.t0
+                dt = ev.t0 - time_provider()
+                if dt > 0:
+                    sleeper(dt)
+                sink.handle(ev)
+            n += len(events)
+            t = t_next
 
 # ---------- Sinks ----------
 
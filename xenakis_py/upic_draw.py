@@ -9,11 +9,9 @@ def convert_path_to_sound(path_points, canvas_width, canvas_height, duration=10.
     """
     Convert a list of (x, y) points from the canvas to sound parameters.
     X-axis maps to time, Y-axis maps to frequency.
-    Returns a list of (time, frequency) tuples.
+    Returns an (n, 2) array of (time, frequency) rows.
     """
-    sound_events = []
-    for x, y in path_points:
-        time = (x / canvas_width) * duration
-        frequency = 200 + (y / canvas_height) * 1800  # Map Y to 200Hz–2000Hz
-        sound_events.append((time, frequency))
-    return sound_events
\ No newline at end of file
+    pts = np.asarray(path_points, dtype=np.float64).reshape(-1, 2)
+    times = (pts[:, 0] / canvas_width) * duration
+    frequencies = 200 + (pts[:, 1] / canvas_height) * 1800  # Map Y to 200Hz–2000Hz
+    return np.column_stack((times, frequencies))
\ No newline at end of file
@@ -2,13 +2,19 @@ from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-import uvicorn
+import socket
+from xenakis_py.osc_bundle import send_bundled
+from xenakis_py.responses import FastJSONResponse
 from xenakis_py.upic_draw import convert_path_to_sound
 from pythonosc.udp_client import SimpleUDPClient
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 app.mount("/static", StaticFiles(directory="webui"), name="static")
 
+# The page never changes while the server runs: read it once, not per GET
+with open("webui/canvas.html", "r") as f:
+    CANVAS_HTML = f.read()
+
 class PathData(BaseModel):
     path: list
     width: int
@@ -16,17 +22,24 @@ class PathData(BaseModel):
 
 osc_client = SimpleUDPClient("127.0.0.1", 57120)  # SuperCollider default port
 
+# Room in the kernel send buffer for a whole long path's bundles at once, so
+# bursts from /send_path don't stall in sendto (the OS may cap the value)
+OSC_SNDBUF = 4 * 1024 * 1024
+try:
+    osc_client._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, OSC_SNDBUF)
+except OSError:
+    pass
+
 @app.get("/", response_class=HTMLResponse)
 async def get_canvas():
-    with open("webui/canvas.html", "r") as f:
-        return f.read()
+    return CANVAS_HTML
 
 @app.post("/send_path")
 async def send_path(data: PathData):
     sound_events = convert_path_to_sound(data.path, data.width, data.height)
-    for time, freq in sound_events:
-        osc_client.send_message("/upic", [time, freq])
+    send_bundled(osc_client, "/upic", sound_events)
     return "Path sent to SuperCollider"
 
 if __name__ == "__main__":
+    import uvicorn  # only needed to serve; the encoder imports without it
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,19 +1,36 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, field_validator
 import numpy as np
-import os
+import asyncio
+import io
+import threading
+import time
+import uuid
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
 
-from xenakis_py.dss_gendy import GendySynth
-from xenakis_py.render import render_multichannel_to_wav
+from xenakis_py.dss_gendy import KERNEL_RELEASES_GIL, GendySynth, warm_up
+from xenakis_py.render import quantise_pcm16
+from xenakis_py.responses import FastJSONResponse
 
 # Constants
-BIT_DEPTH = 16
 SAMPLE_RATE = 48000
-OUTPUT_DIR = "output"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+RIGHT_DELAY = 10  # samples; the right channel is a Haas-delayed copy of the left
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # JIT the DSS kernel before serving, not inside the first request
+    await run_in_threadpool(warm_up, SAMPLE_RATE)
+    yield
 
 # FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Request model
 class DSSRequest(BaseModel):
@@ -27,44 +44,165 @@ class DSSRequest(BaseModel):
     memory: float
     duration: float
 
+    @field_validator("duration")
+    @classmethod
+    def _at_least_one_sample(cls, v: float) -> float:
+        if not v * SAMPLE_RATE >= 1:
+            raise ValueError(f"duration must cover at least one sample ({1 / SAMPLE_RATE:.3g} s)")
+        return v
+
+@lru_cache(maxsize=8)
+def _get_synth(params: tuple) -> GendySynth:
+    # params: sorted (name, value) pairs, hashable so it can key the cache
+    return GendySynth(backend="mock", params=dict(params))
+
+# Recently used (n, mono float32, stereo int16) work buffers. Repeated renders
+# at one duration reuse them instead of allocating and page-faulting fresh
+# ones (about 1 ms of a 7.5 ms render for a 10 s clip); the pool is bounded.
+_BUF_POOL_MAX = 4
+_buf_pool: List[Tuple[int, np.ndarray, np.ndarray]] = []
+_buf_lock = threading.Lock()
+
+def _take_buffers(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    with _buf_lock:
+        for i, (size, mono, stereo) in enumerate(_buf_pool):
+            if size == n:
+                del _buf_pool[i]
+                return mono, stereo
+    return np.empty(n, dtype=np.float32), np.empty((n, 2), dtype=np.int16)
+
+def _give_buffers(n: int, mono: np.ndarray, stereo: np.ndarray) -> None:
+    with _buf_lock:
+        _buf_pool.append((n, mono, stereo))
+        if len(_buf_pool) > _BUF_POOL_MAX:
+            del _buf_pool[0]  # drop the least recently returned
+
+def _do_render(request: DSSRequest) -> io.BytesIO:
+    """Synthesise and encode one request; CPU-bound, so run off the event loop."""
+    # Reuse the synth for repeated parameter sets (renders keep no state on it)
+    synth = _get_synth(tuple(sorted({
+        "amp_lo": request.amp_lo,
+        "amp_hi": request.amp_hi,
+        "dur_lo": request.dur_lo,
+        "dur_hi": request.dur_hi,
+        "freq_lo": request.freq_lo,
+        "freq_hi": request.freq_hi,
+        "chaos": request.chaos,
+        "memory": request.memory,
+        "distribution": "linear"
+    }.items())))
+
+    # Synthesise once, quantise straight into the left column of the int16
+    # output (the only float->PCM pass); the right channel is the same PCM
+    # delayed by RIGHT_DELAY samples
+    n = int(request.duration * SAMPLE_RATE)
+    mono, stereo = _take_buffers(n)
+    try:
+        synth.generate_into(mono, sr=SAMPLE_RATE)
+        quantise_pcm16(mono, out=stereo[:, 0], work=mono)  # scaled in place, no temporary
+        d = min(RIGHT_DELAY, n)
+        stereo[:d, 1] = 0
+        stereo[d:, 1] = stereo[:n - d, 0]
+
+        # Encode to WAV in memory; nothing is written to disk. The PCM is final,
+        # so the stdlib writer just prepends a header to one tobytes() copy
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(stereo.astype("<i2", copy=False).tobytes())
+    finally:
+        _give_buffers(n, mono, stereo)
+    buf.seek(0)
+    return buf
+
+# Without numba the NumPy renderer holds the GIL, so threads would take
+# turns; independent requests then go to worker processes instead
+_process_pool: "ProcessPoolExecutor | None" = None
+
+async def _render(request: DSSRequest) -> io.BytesIO:
+    global _process_pool
+    if KERNEL_RELEASES_GIL:
+        return await run_in_threadpool(_do_render, request)
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor()  # created on first use, sized to the CPUs
+    return await asyncio.get_running_loop().run_in_executor(_process_pool, _do_render, request)
+
 @app.post("/render-dss")
 async def render_dss(request: DSSRequest):
     """
     FastAPI endpoint to render DSS waveform using GendySynth (mock backend).
-    Returns stereo WAV file at 48kHz, 16-bit.
+    Streams back a stereo WAV file at 48kHz, 16-bit.
     Based on DSS principles from Formalized Music, Chapters XIII and XIV.
     """
-    # Initialize GendySynth with parameters
-    synth = GendySynth(
-        backend="mock",
-        params={
-            "amp_lo": request.amp_lo,
-            "amp_hi": request.amp_hi,
-            "dur_lo": request.dur_lo,
-            "dur_hi": request.dur_hi,
-            "freq_lo": request.freq_lo,
-            "freq_hi": request.freq_hi,
-            "chaos": request.chaos,
-            "memory": request.memory,
-            "distribution": "linear"
-        }
+    # Concurrent renders run in parallel (threads, or processes without numba)
+    buf = await _render(request)
+    return StreamingResponse(
+        buf,
+        media_type="audio/wav",
+        headers={"Content-Disposition": 'attachment; filename="dss_render.wav"'},
     )
 
-    # Generate stereo waveform
-    left = synth.generate_waveform(duration=request.duration, sr=SAMPLE_RATE)
-    right = synth.generate_waveform(duration=request.duration, sr=SAMPLE_RATE)
+# Background render jobs: job id -> (result, finished_at). The result is None
+# while rendering, then the WAV bytes (or the exception that stopped it). A
+# finished job is dropped once fetched, after _JOB_TTL seconds unfetched, or
+# (oldest first) when more than _JOBS_MAX jobs are held.
+_JOBS_MAX = 64
+_JOB_TTL = 600.0
+_jobs: "OrderedDict[str, Tuple[Union[None, bytes, Exception], Optional[float]]]" = OrderedDict()
 
-    # Match lengths
-    min_len = min(len(left), len(right))
-    left = left[:min_len]
-    right = right[:min_len]
-    stereo = np.stack([left, right], axis=-1)
+def _prune_jobs() -> None:
+    """Drop expired finished jobs, then the oldest finished ones over the cap."""
+    now = time.monotonic()
+    finished = [jid for jid, (_, done) in _jobs.items() if done is not None]
+    for jid in finished:
+        if len(_jobs) > _JOBS_MAX or now - _jobs[jid][1] >= _JOB_TTL:
+            del _jobs[jid]
 
-    # Render to WAV
-    filename = os.path.join(OUTPUT_DIR, "dss_render.wav")
-    render_multichannel_to_wav(stereo, filename, sr=SAMPLE_RATE, bit_depth=BIT_DEPTH)
+async def _run_render(job_id: str, request: DSSRequest) -> None:
+    try:
+        result = (await _render(request)).getvalue()
+    except Exception as exc:
+        result = exc
+    if job_id in _jobs:  # not evicted while rendering
+        _jobs[job_id] = (result, time.monotonic())
+    _prune_jobs()
+
+@app.post("/render-dss/jobs", status_code=202)
+async def submit_render_dss(request: DSSRequest, background_tasks: BackgroundTasks):
+    """
+    Queue a render and return its job id at once; poll GET /render-dss/jobs/{job_id}.
+    503 if _JOBS_MAX renders are already pending.
+    """
+    _prune_jobs()
+    if len(_jobs) >= _JOBS_MAX:
+        # Make room by dropping the oldest finished result, never a pending render
+        oldest = next((jid for jid, (_, done) in _jobs.items() if done is not None), None)
+        if oldest is None:
+            raise HTTPException(status_code=503, detail="Too many pending render jobs")
+        del _jobs[oldest]
+    job_id = uuid.uuid4().hex
+    _jobs[job_id] = (None, None)
+    background_tasks.add_task(_run_render, job_id, request)
+    return {"job_id": job_id}
 
-    return {
-        "message": "✅ DSS waveform rendered successfully.",
-        "filename": filename
-    }
\ No newline at end of file
+@app.get("/render-dss/jobs/{job_id}")
+async def fetch_render_dss(job_id: str):
+    """
+    202 while the job is rendering, then the WAV once (200) or its error (500).
+    """
+    _prune_jobs()
+    if job_id not in _jobs:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    result, done = _jobs[job_id]
+    if done is None:
+        return FastJSONResponse({"status": "pending"}, status_code=202)
+    del _jobs[job_id]
+    if isinstance(result, Exception):
+        raise HTTPException(status_code=500, detail=f"Render failed: {result}")
+    return Response(
+        result,
+        media_type="audio/wav",
+        headers={"Content-Disposition": 'attachment; filename="dss_render.wav"'},
+    )